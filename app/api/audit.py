@@ -2,32 +2,124 @@
 Audit Logs API - View audit trail and statistics
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import Optional
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, tuple_, select, lambda_stmt
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from typing import Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 import logging
 
 from app.database import get_db
 from app.schemas import AuditLogResponse, AuditLogListResponse, AuditStatsResponse
-from app.models import AuditLog, User, AuditEventType, Task
+from app.models import AuditLog, User, UserRole, AuditEventType, Task
 from app.core.dependencies import get_current_user, get_current_admin_user
+from app.core.cache import cached_json
+from app.core.config import settings
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.http_cache import conditional_json_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Validates a whole page of ORM rows in one pydantic-core call
+_AUDIT_LOGS_ADAPTER = TypeAdapter(List[AuditLogResponse])
+
+def _log_filters(
+    stmt: StatementLambdaElement,
+    user_id: Optional[UUID],
+    event_type: Optional[AuditEventType],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> StatementLambdaElement:
+    """
+    Append the optional list filters to a lambda statement.
+    
+    Each lambda is cached by code location, so SQL for every filter combination
+    is compiled once; filter values become bound parameters at execute time.
+    Shared by the page query and the optional COUNT query.
+    
+    Naive start/end dates are read as UTC. asyncpg would otherwise convert them
+    from the server's local time when binding them to the timestamptz column.
+    """
+    if start_date and start_date.tzinfo is None:
+        start_date = start_date.replace(tzinfo=timezone.utc)
+    if end_date and end_date.tzinfo is None:
+        end_date = end_date.replace(tzinfo=timezone.utc)
+    
+    if user_id:
+        stmt += lambda s: s.where(AuditLog.user_id == user_id)
+    if event_type:
+        stmt += lambda s: s.where(AuditLog.event_type == event_type)
+    if start_date:
+        stmt += lambda s: s.where(AuditLog.timestamp >= start_date)
+    if end_date:
+        stmt += lambda s: s.where(AuditLog.timestamp <= end_date)
+    return stmt
+
+async def _count_logs(db: AsyncSession, **filters) -> int:
+    """COUNT(*) of audit logs matching the given _log_filters() filters."""
+    stmt = _log_filters(lambda_stmt(lambda: select(func.count()).select_from(AuditLog)), **filters)
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+async def _fetch_page(
+    db: AsyncSession,
+    stmt: StatementLambdaElement,
+    page_size: int,
+    cursor: Optional[str]
+) -> Tuple[List[AuditLogResponse], Optional[str]]:
+    """
+    Fetch one page of audit logs using keyset (seek) pagination.
+    
+    Rows are ordered by (timestamp, id) descending so the cursor is a
+    stable position - an index seek instead of scanning OFFSET rows.
+    One extra row is fetched to detect whether a next page exists.
+    
+    The page is validated into response models with one TypeAdapter call
+    (runs in pydantic-core) instead of a per-row model_validate loop.
+    
+    Returns:
+        (logs, next_cursor) - next_cursor is None on the last page
+        
+    Raises:
+        400: Malformed cursor
+    """
+    if cursor:
+        try:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        stmt += lambda s: s.where(tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(cursor_ts, cursor_id))
+    
+    limit = page_size + 1
+    stmt += lambda s: s.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit)
+    result = await db.execute(stmt)
+    rows = result.scalars().all()
+    
+    next_cursor = None
+    if len(rows) > page_size:  # Extra row means there is another page
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    
+    return _AUDIT_LOGS_ADAPTER.validate_python(rows, from_attributes=True), next_cursor
+
 @router.get("/logs", response_model=AuditLogListResponse)
-def get_audit_logs(
-    page: int = Query(1, ge=1),
+async def get_audit_logs(
+    cursor: Optional[str] = Query(None, description="Cursor from previous page's next_cursor"),
     page_size: int = Query(50, ge=1, le=100),
+    include_total: bool = Query(False, description="Also return total matching count (extra COUNT query)"),
     user_id: Optional[UUID] = Query(None, description="Filter by user ID"),
     event_type: Optional[AuditEventType] = Query(None, description="Filter by event type"),
     start_date: Optional[datetime] = Query(None, description="Filter from date"),
     end_date: Optional[datetime] = Query(None, description="Filter to date"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get paginated audit logs.
@@ -36,8 +128,9 @@ def get_audit_logs(
     Admins see all actions or filtered by user_id.
     
     Query parameters:
-        - page: Page number
+        - cursor: Opaque cursor from previous response (omit for first page)
         - page_size: Items per page (max 100)
+        - include_total: Run a COUNT for the total (off by default)
         - user_id: Filter by specific user (admin only)
         - event_type: Filter by event type
         - start_date: Filter from timestamp
@@ -46,55 +139,44 @@ def get_audit_logs(
     Returns:
         AuditLogListResponse with logs and pagination
     """
-    logger.info(f"➡️  Get audit logs request from: {current_user.email}")
-    
-    # Build base query
-    query = db.query(AuditLog)
+    logger.info("➡️  Get audit logs request from: %s", current_user.email)
     
     # Regular users can only see their own logs
-    if current_user.role.value != "ADMIN":
-        query = query.filter(AuditLog.user_id == current_user.id)
+    if current_user.role is not UserRole.ADMIN:
         if user_id and user_id != current_user.id:
             # Regular user trying to filter by different user
-            logger.warning(f"⚠️  User {current_user.email} attempted to view other user's logs")
+            logger.warning("⚠️  User %s attempted to view other user's logs", current_user.email)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only view your own audit logs"
             )
-    else:
-        # Admin can filter by specific user
-        if user_id:
-            query = query.filter(AuditLog.user_id == user_id)
+        user_id = current_user.id
+    # Admin can filter by specific user (or see all if user_id not given)
     
-    # Apply filters
-    if event_type:
-        query = query.filter(AuditLog.event_type == event_type)
-    if start_date:
-        query = query.filter(AuditLog.timestamp >= start_date)
-    if end_date:
-        query = query.filter(AuditLog.timestamp <= end_date)
+    # Build query (cached lambda statement - see _log_filters)
+    filters = dict(user_id=user_id, event_type=event_type, start_date=start_date, end_date=end_date)
+    query = _log_filters(lambda_stmt(lambda: select(AuditLog)), **filters)
     
-    # Get total count
-    total = query.count()
+    # Get total count only when asked - next_cursor already tells the client if more pages exist
+    total = await _count_logs(db, **filters) if include_total else None
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    logs = query.order_by(AuditLog.timestamp.desc()).offset(offset).limit(page_size).all()
+    # Apply keyset pagination
+    logs, next_cursor = await _fetch_page(db, query, page_size, cursor)
     
-    logger.info(f"✅ Returning {len(logs)} audit logs (total: {total})")
+    logger.info("✅ Returning %s audit logs (total: %s)", len(logs), total)
     
     return AuditLogListResponse(
-        logs=[AuditLogResponse.model_validate(log) for log in logs],  # Pydantic V2
+        logs=logs,
         total=total,
-        page=page,
+        next_cursor=next_cursor,
         page_size=page_size
     )
 
 @router.get("/logs/{log_id}", response_model=AuditLogResponse)
-def get_audit_log(
+async def get_audit_log(
     log_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get single audit log entry by ID.
@@ -109,92 +191,112 @@ def get_audit_log(
         404: Log not found
         403: No permission
     """
-    logger.info(f"➡️  Get audit log {log_id} request from: {current_user.email}")
+    logger.info("➡️  Get audit log %s request from: %s", log_id, current_user.email)
     
     # Find log
-    log = db.query(AuditLog).filter(AuditLog.id == log_id).first()
+    log = await db.get(AuditLog, log_id)  # PK lookup - identity map first, then direct SELECT
     if not log:
-        logger.warning(f"⚠️  Audit log {log_id} not found")
+        logger.warning("⚠️  Audit log %s not found", log_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Audit log with ID {log_id} not found"
         )
     
     # Check permissions
-    if current_user.role.value != "ADMIN" and log.user_id != current_user.id:
-        logger.warning(f"⚠️  User {current_user.email} denied access to log {log_id}")
+    if current_user.role is not UserRole.ADMIN and log.user_id != current_user.id:
+        logger.warning("⚠️  User %s denied access to log %s", current_user.email, log_id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only view your own audit logs"
         )
     
-    logger.info(f"✅ Returning audit log {log_id}")
+    logger.info("✅ Returning audit log %s", log_id)
     return AuditLogResponse.model_validate(log)  # Pydantic V2
 
+STATS_CACHE_KEY = "audit:stats:v1"  # Bump version if AuditStatsResponse changes shape
+
+async def _compute_audit_stats(db: AsyncSession) -> str:
+    """
+    Run the aggregate query behind /stats and return it as JSON.
+    
+    Expensive full-table scan - called only on cache miss.
+    """
+    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # Users with activity: COUNT over a GROUP BY subquery lets Postgres hash-aggregate
+    # (or index-only scan user_id) instead of the sort-dedup COUNT(DISTINCT) does
+    active_users = (
+        select(AuditLog.user_id)
+        .where(AuditLog.user_id.is_not(None))  # Logs of deleted users would form a NULL group
+        .group_by(AuditLog.user_id)
+        .subquery()
+    )
+    total_users = select(func.count()).select_from(active_users).scalar_subquery()
+    
+    # One pass over audit_logs using conditional aggregation (COUNT(*) FILTER (WHERE ...))
+    # instead of seven separate COUNT queries / round trips
+    result = await db.execute(
+        select(
+            func.count().label("total_events"),
+            func.count().filter(AuditLog.timestamp >= today_start).label("events_today"),
+            func.count().filter(AuditLog.event_type == AuditEventType.USER_LOGIN_FAILED).label("failed_logins"),
+            total_users.label("total_users"),
+            func.count().filter(AuditLog.event_type == AuditEventType.TASK_CREATE).label("total_tasks_created"),
+            func.count().filter(AuditLog.event_type == AuditEventType.TASK_UPDATE).label("total_tasks_updated"),
+            func.count().filter(AuditLog.event_type == AuditEventType.TASK_DELETE).label("total_tasks_deleted"),
+        ).select_from(AuditLog)
+    )
+    row = result.one()
+    
+    return AuditStatsResponse(
+        total_events=row.total_events or 0,
+        events_today=row.events_today or 0,
+        failed_logins=row.failed_logins or 0,
+        total_users=row.total_users or 0,
+        total_tasks_created=row.total_tasks_created or 0,
+        total_tasks_updated=row.total_tasks_updated or 0,
+        total_tasks_deleted=row.total_tasks_deleted or 0
+    ).model_dump_json()
+
 @router.get("/stats", response_model=AuditStatsResponse)
-def get_audit_stats(
+async def get_audit_stats(
+    request: Request,
     current_admin: User = Depends(get_current_admin_user),  # Admin only
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get audit log statistics (admin only).
     
+    Served from Redis (cache-aside, short TTL) since dashboards poll this
+    and the underlying counts change slowly. The cached JSON is sent as-is
+    with an ETag, so repeat polls with If-None-Match get a bodiless 304.
+    
     Returns:
         AuditStatsResponse with aggregated metrics
     """
-    logger.info(f"➡️  Get audit stats request from: {current_admin.email}")
-    
-    # Total events
-    total_events = db.query(func.count(AuditLog.id)).scalar()
-    
-    # Events today
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    events_today = db.query(func.count(AuditLog.id)).filter(
-        AuditLog.timestamp >= today_start
-    ).scalar()
-    
-    # Failed logins
-    failed_logins = db.query(func.count(AuditLog.id)).filter(
-        AuditLog.event_type == AuditEventType.USER_LOGIN_FAILED
-    ).scalar()
-    
-    # Total users with activity
-    total_users = db.query(func.count(func.distinct(AuditLog.user_id))).scalar()
+    logger.info("➡️  Get audit stats request from: %s", current_admin.email)
     
-    # Task statistics
-    total_tasks_created = db.query(func.count(AuditLog.id)).filter(
-        AuditLog.event_type == AuditEventType.TASK_CREATE
-    ).scalar()
-    
-    total_tasks_updated = db.query(func.count(AuditLog.id)).filter(
-        AuditLog.event_type == AuditEventType.TASK_UPDATE
-    ).scalar()
-    
-    total_tasks_deleted = db.query(func.count(AuditLog.id)).filter(
-        AuditLog.event_type == AuditEventType.TASK_DELETE
-    ).scalar()
-    
-    logger.info(f"✅ Returning audit statistics")
-    
-    return AuditStatsResponse(
-        total_events=total_events or 0,
-        events_today=events_today or 0,
-        failed_logins=failed_logins or 0,
-        total_users=total_users or 0,
-        total_tasks_created=total_tasks_created or 0,
-        total_tasks_updated=total_tasks_updated or 0,
-        total_tasks_deleted=total_tasks_deleted or 0
+    # Cache-aside: only a miss (or expired entry) runs the aggregate queries
+    stats_json = await cached_json(
+        STATS_CACHE_KEY,
+        settings.AUDIT_STATS_CACHE_TTL,
+        lambda: _compute_audit_stats(db)
     )
+    
+    logger.info("✅ Returning audit statistics")
+    return conditional_json_response(request, stats_json, settings.HTTP_CACHE_MAX_AGE)
 
 @router.get("/my-history", response_model=AuditLogListResponse)
-def get_my_history(
-    page: int = Query(1, ge=1),
+async def get_my_history(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor from previous page's next_cursor"),
     page_size: int = Query(50, ge=1, le=100),
+    include_total: bool = Query(False, description="Also return total matching count (extra COUNT query)"),
     event_type: Optional[AuditEventType] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current user's audit history.
@@ -202,34 +304,34 @@ def get_my_history(
     Convenience endpoint for users to view their own activity.
     Same as /logs but automatically filtered to current user.
     
+    The first page (what a refresh loads) carries ETag/Cache-Control
+    headers and answers a matching If-None-Match with 304.
+    
     Returns:
         AuditLogListResponse with user's activity
     """
-    logger.info(f"➡️  Get my history request from: {current_user.email}")
+    logger.info("➡️  Get my history request from: %s", current_user.email)
     
-    # Query only current user's logs
-    query = db.query(AuditLog).filter(AuditLog.user_id == current_user.id)
+    # Query only current user's logs (cached lambda statement - see _log_filters)
+    filters = dict(user_id=current_user.id, event_type=event_type, start_date=start_date, end_date=end_date)
+    query = _log_filters(lambda_stmt(lambda: select(AuditLog)), **filters)
     
-    # Apply filters
-    if event_type:
-        query = query.filter(AuditLog.event_type == event_type)
-    if start_date:
-        query = query.filter(AuditLog.timestamp >= start_date)
-    if end_date:
-        query = query.filter(AuditLog.timestamp <= end_date)
-    
-    # Get total count
-    total = query.count()
+    # Get total count only when asked - next_cursor already tells the client if more pages exist
+    total = await _count_logs(db, **filters) if include_total else None
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    logs = query.order_by(AuditLog.timestamp.desc()).offset(offset).limit(page_size).all()
+    # Apply keyset pagination
+    logs, next_cursor = await _fetch_page(db, query, page_size, cursor)
     
-    logger.info(f"✅ Returning {len(logs)} history entries")
+    logger.info("✅ Returning %s history entries", len(logs))
     
-    return AuditLogListResponse(
-        logs=[AuditLogResponse.model_validate(log) for log in logs],  # Pydantic V2
+    history = AuditLogListResponse(
+        logs=logs,
         total=total,
-        page=page,
+        next_cursor=next_cursor,
         page_size=page_size
-    )
\ No newline at end of file
+    )
+    
+    # First page is the one users re-poll - make it conditionally cacheable
+    if cursor is None:
+        return conditional_json_response(request, history.model_dump_json(), settings.HTTP_CACHE_MAX_AGE)
+    return history
\ No newline at end of file
@@ -2,37 +2,39 @@
 Authentication API - User registration, login, logout endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 import logging
 
 from app.database import get_db
-from app.schemas import UserCreate, UserLogin, TokenResponse, UserResponse
+from app.schemas import UserCreate, UserLogin, TokenResponse, UserResponse, MessageResponse
 from app.models import User
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import ahash_password, averify_password, adummy_verify, password_needs_rehash, create_access_token
 from app.core.dependencies import get_current_user
-from app.utils.audit_logger import log_user_login, log_user_logout, log_user_register
+from app.utils.audit_logger import AuditActor, log_user_login, log_user_logout, log_user_register, log_in_background
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate,  # Validated by Pydantic (email, password, full_name)
     request: Request,  # Request object for audit logging
-    db: Session = Depends(get_db)  # Database session
+    background: BackgroundTasks,  # Audit write runs after the response is sent
+    db: AsyncSession = Depends(get_db)  # Database session
 ):
     """
     Register new user account.
     
     Process:
         1. Validate input (Pydantic handles this)
-        2. Check if email already exists
-        3. Hash password
-        4. Create user in database
-        5. Generate JWT token
-        6. Log registration in audit trail
+        2. Hash password (also for duplicate emails - see note below)
+        3. Insert user (atomically skipped if email already exists)
+        4. Generate JWT token
+        5. Schedule registration audit log (runs after response)
         
     Returns:
         TokenResponse with JWT and user info
@@ -41,37 +43,46 @@ def register(
         409: Email already registered
         500: Database error
     """
-    logger.info(f"➡️  Registration attempt for email: {user_data.email}")
-    
-    # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        logger.warning(f"⚠️  Registration failed - email already exists: {user_data.email}")
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered. Please use a different email or login."
+    logger.info("➡️  Registration attempt for email: %s", user_data.email)
+    
+    # Hash password before storing (CPU-bound - runs on the hashing thread pool)
+    # Accepted trade-off: the hash runs before we know whether the email is taken, so a
+    # duplicate signup costs a full argon2id hash (64 MiB, ~tens of ms) before its 409.
+    # Repeated duplicate POSTs can therefore burn hashing CPU on this unauthenticated
+    # endpoint - /register must be rate-limited per client IP at the proxy/gateway
+    # (the app itself has no rate limiter). In exchange: one round trip, race-safe insert.
+    hashed_password = await ahash_password(user_data.password)
+    
+    # Create new user - INSERT ... ON CONFLICT (email) DO NOTHING RETURNING
+    # One round trip instead of SELECT + INSERT, and race-safe against concurrent signups
+    stmt = (
+        pg_insert(User)
+        .values(
+            email=user_data.email,
+            password_hash=hashed_password,
+            full_name=user_data.full_name,
+            # role defaults to USER (set in model)
+            # is_active defaults to True
         )
-    
-    # Hash password before storing
-    hashed_password = hash_password(user_data.password)
-    
-    # Create new user
-    new_user = User(
-        email=user_data.email,
-        password_hash=hashed_password,
-        full_name=user_data.full_name,
-        # role defaults to USER (set in model)
-        # is_active defaults to True
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
     )
     
     try:
-        db.add(new_user)  # Add to session
-        db.commit()  # Save to database
-        db.refresh(new_user)  # Refresh to get generated ID
-        logger.info(f"✅ User registered successfully: {new_user.email}")
+        result = await db.execute(stmt)
+        new_user = result.scalar_one_or_none()  # None means the email was already taken
+        if new_user is None:
+            await db.rollback()
+            logger.warning("⚠️  Registration failed - email already exists: %s", user_data.email)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Email already registered. Please use a different email or login."
+            )
+        await db.commit()  # Save to database
+        logger.info("✅ User registered successfully: %s", new_user.email)
         
-        # Log registration in audit trail
-        log_user_register(db=db, user=new_user, request=request)
+        # Log registration in audit trail (off the request path)
+        background.add_task(log_in_background, log_user_register, user=AuditActor.of(new_user), request=request)
         
         # Generate JWT token
         access_token = create_access_token(data={"sub": str(new_user.id)})
@@ -82,19 +93,22 @@ def register(
             user=UserResponse.model_validate(new_user)  # Pydantic V2
         )
         
+    except HTTPException:
+        raise  # Duplicate email - already handled above
     except Exception as e:
-        db.rollback()  # Rollback on error
-        logger.error(f"❌ Registration failed for {user_data.email}: {str(e)}", exc_info=True)
+        await db.rollback()  # Rollback on error
+        logger.error("❌ Registration failed for %s: %s", user_data.email, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Registration failed. Please try again later."
         )
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     credentials: UserLogin,  # Validated by Pydantic (email, password)
     request: Request,
-    db: Session = Depends(get_db)
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Authenticate user and return JWT token.
@@ -102,10 +116,9 @@ def login(
     Process:
         1. Validate input
         2. Find user by email
-        3. Verify password
-        4. Update last_login timestamp
-        5. Generate JWT token
-        6. Log successful login
+        3. Verify password (upgrade hash if outdated)
+        4. Generate JWT token
+        5. Schedule last_login update + login audit log (one transaction, runs after response)
         
     Returns:
         TokenResponse with JWT and user info
@@ -115,23 +128,26 @@ def login(
         403: Account inactive
         500: Database error
     """
-    logger.info(f"➡️  Login attempt for email: {credentials.email}")
+    logger.info("➡️  Login attempt for email: %s", credentials.email)
     
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    result = await db.execute(select(User).where(User.email == credentials.email))
+    user = result.scalar_one_or_none()
     if not user:
-        logger.warning(f"⚠️  Login failed - user not found: {credentials.email}")
+        await adummy_verify()  # Same hashing cost as a wrong password - no email enumeration by timing
+        logger.warning("⚠️  Login failed - user not found: %s", credentials.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.password_hash):
-        logger.warning(f"⚠️  Login failed - incorrect password: {credentials.email}")
-        # Log failed login attempt
+    if not await averify_password(credentials.password, user.password_hash):
+        logger.warning("⚠️  Login failed - incorrect password: %s", credentials.email)
+        # Log failed login attempt inline - background tasks are dropped when
+        # the endpoint raises, and this path doesn't need to be fast anyway
         try:
-            log_user_login(db=db, user=user, request=request, success=False)
+            await log_user_login(db=db, user=user, request=request, success=False)
         except:
             pass  # Don't fail login if audit log fails
         raise HTTPException(
@@ -141,32 +157,40 @@ def login(
     
     # Check if account is active
     if not user.is_active:
-        logger.warning(f"⚠️  Login failed - inactive account: {credentials.email}")
+        logger.warning("⚠️  Login failed - inactive account: %s", credentials.email)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is inactive. Please contact administrator."
         )
     
-    # Update last_login timestamp
-    try:
-        user.last_login = datetime.utcnow()
-        db.commit()
-    except Exception as e:
-        logger.error(f"⚠️  Failed to update last_login: {str(e)}")
-        db.rollback()
-        # Continue anyway - login should succeed even if timestamp update fails
+    # Upgrade legacy (bcrypt) or outdated hashes while the plaintext is at hand - once per user
+    if password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = await ahash_password(credentials.password)
+            await db.commit()
+            logger.info("✅ Password hash upgraded for: %s", user.email)
+        except Exception as e:
+            await db.rollback()
+            logger.error("⚠️  Failed to upgrade password hash: %s", e)
+            # Continue - the old hash still works
+    
+    # New last_login is written by the background audit task in the same
+    # transaction as the login audit row (one commit per login instead of two);
+    # set it in memory so the response already shows it. The task also drops the
+    # cached profile - after its commit, so /auth/me can't re-cache the old value
+    login_time = datetime.now(timezone.utc)
+    user.last_login = login_time
     
     # Generate JWT token
     access_token = create_access_token(data={"sub": str(user.id)})
     
-    # Log successful login
-    try:
-        log_user_login(db=db, user=user, request=request, success=True)
-    except Exception as e:
-        logger.error(f"⚠️  Failed to log login: {str(e)}")
-        # Continue - login should succeed even if audit log fails
+    # Log successful login + persist last_login (off the request path - failures are logged, never raised)
+    background.add_task(
+        log_in_background, log_user_login,
+        user=AuditActor.of(user), request=request, success=True, last_login=login_time
+    )
     
-    logger.info(f"✅ Login successful: {user.email}")
+    logger.info("✅ Login successful: %s", user.email)
     
     return TokenResponse(
         access_token=access_token,
@@ -174,11 +198,11 @@ def login(
         user=UserResponse.model_validate(user)  # Pydantic V2
     )
 
-@router.post("/logout", status_code=status.HTTP_200_OK)
-def logout(
+@router.post("/logout", response_model=MessageResponse, status_code=status.HTTP_200_OK)
+async def logout(
     request: Request,
-    current_user: User = Depends(get_current_user),  # Require authentication
-    db: Session = Depends(get_db)
+    background: BackgroundTasks,
+    current_user: User = Depends(get_current_user)  # Require authentication
 ):
     """
     Logout current user.
@@ -191,21 +215,17 @@ def logout(
     Returns:
         Success message
     """
-    logger.info(f"➡️  Logout request from: {current_user.email}")
+    logger.info("➡️  Logout request from: %s", current_user.email)
     
-    # Log logout in audit trail
-    try:
-        log_user_logout(db=db, user=current_user, request=request)
-    except Exception as e:
-        logger.error(f"⚠️  Failed to log logout: {str(e)}")
-        # Continue - logout should succeed even if audit log fails
+    # Log logout in audit trail (off the request path - failures are logged, never raised)
+    background.add_task(log_in_background, log_user_logout, user=AuditActor.of(current_user), request=request)
     
-    logger.info(f"✅ User logged out: {current_user.email}")
+    logger.info("✅ User logged out: %s", current_user.email)
     
-    return {"message": "Successfully logged out"}
+    return MessageResponse(message="Successfully logged out")
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(
+async def get_current_user_info(
     current_user: User = Depends(get_current_user)  # Require authentication
 ):
     """
@@ -216,5 +236,5 @@ def get_current_user_info(
     Returns:
         UserResponse with current user's info
     """
-    logger.debug(f"➡️  Profile request from: {current_user.email}")
+    logger.debug("➡️  Profile request from: %s", current_user.email)
     return UserResponse.model_validate(current_user)  # Pydantic V2
\ No newline at end of file
@@ -2,30 +2,139 @@
 Tasks API - CRUD operations for task management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
+from sqlalchemy import select, exists, func, or_, tuple_, union_all
+from sqlalchemy.orm import aliased, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Optional
 from uuid import UUID
+from enum import Enum
 import logging
 
-from app.database import get_db
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse
-from app.models import Task, User, TaskStatus, TaskPriority
+from app.database import get_db, count_rows
+from app.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskListItem, TaskListResponse, MessageResponse
+from app.models import Task, User, UserRole, TaskStatus, TaskPriority
 from app.core.dependencies import get_current_user, get_current_admin_user
 from app.utils.audit_logger import log_task_create, log_task_update, log_task_delete
+from app.utils.pagination import encode_cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# TaskUpdate fields backed by NOT NULL columns
+_REQUIRED_TASK_FIELDS = ("title", "status", "priority")
+
+# Columns behind TaskListItem - list pages skip the (possibly large) description
+_LIST_COLUMNS = (
+    Task.id, Task.title, Task.status, Task.priority, Task.assigned_to_id,
+    Task.created_by_id, Task.created_at, Task.updated_at,
+)
+
+async def _user_exists(db: AsyncSession, user_id: UUID) -> bool:
+    """Check a user exists via SELECT EXISTS (no row/columns loaded)."""
+    result = await db.execute(select(exists().where(User.id == user_id)))
+    return bool(result.scalar())
+
+async def _task_for_user(
+    db: AsyncSession,
+    task_id: UUID,
+    user: User,
+    *,
+    action: str,
+    denied_detail: str,
+    creator_only: bool = False
+) -> Task:
+    """
+    Load a task the user is allowed to act on - permission check is part of the query.
+    
+    Admins may act on any task. Regular users only on tasks they created or are
+    assigned to (creator_only: tasks they created).
+    
+    Returns:
+        Task object
+        
+    Raises:
+        HTTPException 404: Task does not exist
+        HTTPException 403: Task exists but belongs to someone else (denied_detail)
+    """
+    if user.role is UserRole.ADMIN:
+        # No ownership filter - plain PK lookup (identity map first, cached statement)
+        task = await db.get(Task, task_id)
+    else:
+        query = select(Task).where(Task.id == task_id)
+        if creator_only:
+            query = query.where(Task.created_by_id == user.id)
+        else:
+            query = query.where(or_(Task.created_by_id == user.id, Task.assigned_to_id == user.id))
+        task = (await db.execute(query)).scalar_one_or_none()
+    
+    if task is not None:
+        return task
+    
+    # Not visible to this user - only now check whether it exists at all (403 vs 404)
+    if user.role is not UserRole.ADMIN:
+        found = await db.execute(select(exists().where(Task.id == task_id)))
+        if found.scalar():
+            logger.warning("⚠️  User %s denied access to %s task %s", user.email, action, task_id)
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=denied_detail)
+    
+    logger.warning("⚠️  Task %s not found", task_id)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Task with ID {task_id} not found"
+    )
+
+def _task_response(task: Task) -> TaskResponse:
+    """
+    Build a TaskResponse from a loaded Task without re-running validation.
+    
+    Column values come straight from the database and already match the schema
+    types, so model_construct() just sets the fields. Inbound TaskCreate/TaskUpdate
+    bodies are still fully validated by FastAPI.
+    """
+    return TaskResponse.model_construct(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        priority=task.priority,
+        assigned_to_id=task.assigned_to_id,
+        status=task.status,
+        created_by_id=task.created_by_id,
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+    )
+
+def _audit_value(value: Any) -> Any:
+    """JSON-friendly form of a task attribute for audit snapshots (enum value, UUID string)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+def _task_list_item(task: Task) -> TaskListItem:
+    """List-page counterpart of _task_response() - reads only the _LIST_COLUMNS attributes."""
+    return TaskListItem.model_construct(
+        id=task.id,
+        title=task.title,
+        status=task.status,
+        priority=task.priority,
+        assigned_to_id=task.assigned_to_id,
+        created_by_id=task.created_by_id,
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+    )
+
 @router.get("", response_model=TaskListResponse)
-def get_tasks(
+async def get_tasks(
     request: Request,
-    page: int = Query(1, ge=1, description="Page number"),  # Minimum 1
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),  # Minimum 1
+    cursor: Optional[str] = Query(None, description="Cursor from previous page's next_cursor"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),  # Between 1-100
-    status: Optional[TaskStatus] = Query(None, description="Filter by status"),
+    task_status: Optional[TaskStatus] = Query(None, alias="status", description="Filter by status"),  # Renamed so it doesn't shadow fastapi.status
     priority: Optional[TaskPriority] = Query(None, description="Filter by priority"),
     current_user: User = Depends(get_current_user),  # Require authentication
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get paginated list of tasks.
@@ -33,8 +142,15 @@ def get_tasks(
     Regular users see only their tasks (created by or assigned to them).
     Admins see all tasks.
     
+    Two ways to page through the list:
+        - cursor (preferred): pass next_cursor back to seek straight to the next
+          page - cost doesn't grow with depth. total is only reported on page-number
+          requests (the cursor already excludes the rows before it)
+        - page: classic page numbers (OFFSET - deep pages get slower)
+    
     Query parameters:
         - page: Page number (default 1)
+        - cursor: Opaque cursor from previous response
         - page_size: Items per page (default 20, max 100)
         - status: Filter by task status
         - priority: Filter by task priority
@@ -42,46 +158,96 @@ def get_tasks(
     Returns:
         TaskListResponse with tasks, pagination info
     """
-    logger.info(f"➡️  Get tasks request from: {current_user.email} (page {page})")
+    if cursor:
+        logger.info("➡️  Get tasks request from: %s (cursor page)", current_user.email)
+    else:
+        logger.info("➡️  Get tasks request from: %s (page %s)", current_user.email, page)
     
-    # Build base query
-    query = db.query(Task)
+    # Optional filters (applied to every branch below)
+    filters = []
+    if task_status:
+        filters.append(Task.status == task_status)
+    if priority:
+        filters.append(Task.priority == priority)
     
     # Filter tasks based on user role
-    if current_user.role.value != "ADMIN":  # Regular user
-        # Show only tasks created by or assigned to this user
-        query = query.filter(
-            (Task.created_by_id == current_user.id) | (Task.assigned_to_id == current_user.id)
+    if current_user.role is not UserRole.ADMIN:  # Regular user
+        # Show only tasks created by or assigned to this user. An OR across two columns
+        # can't use either index, so run two index seeks glued with UNION ALL instead
+        # (second branch skips self-assigned tasks, which the first already returned)
+        created = select(*_LIST_COLUMNS).where(Task.created_by_id == current_user.id, *filters)
+        assigned = select(*_LIST_COLUMNS).where(
+            Task.assigned_to_id == current_user.id, Task.created_by_id != current_user.id, *filters
         )
-    # Admins see all tasks (no filter)
+        task_entity = aliased(Task, union_all(created, assigned).subquery())
+        query = select(task_entity).options(
+            load_only(*(getattr(task_entity, column.key) for column in _LIST_COLUMNS))
+        )
+    else:
+        # Admins see all tasks (no owner filter)
+        task_entity = Task
+        query = select(Task).options(load_only(*_LIST_COLUMNS)).where(*filters)
     
-    # Apply optional filters
-    if status:
-        query = query.filter(Task.status == status)
-    if priority:
-        query = query.filter(Task.priority == priority)
+    # Newest first, id as tie-breaker so the cursor position is unique
+    order = (task_entity.created_at.desc(), task_entity.id.desc())
     
-    # Get total count (before pagination)
-    total = query.count()
+    if cursor:
+        # Keyset pagination - index seek past the last row of the previous page
+        try:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        result = await db.execute(
+            query.where(tuple_(task_entity.created_at, task_entity.id) < tuple_(cursor_ts, cursor_id))
+            .order_by(*order)
+            .limit(page_size + 1)  # One extra row tells us whether another page exists
+        )
+        tasks = result.scalars().all()
+        has_more = len(tasks) > page_size
+        tasks = tasks[:page_size]
+        total = None
+    else:
+        # Fetch the page and the total in one round trip - count(*) OVER () is computed
+        # over the filtered rows before OFFSET/LIMIT, so every row carries the full total
+        offset = (page - 1) * page_size
+        result = await db.execute(
+            query.add_columns(func.count().over().label("total"))
+            .order_by(*order)
+            .offset(offset)
+            .limit(page_size)
+        )
+        rows = result.all()
+        tasks = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        else:
+            # Empty page: either no matches at all, or a page past the end (still report the real total)
+            total = await count_rows(db, query) if offset else 0
+        has_more = offset + len(tasks) < total
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    tasks = query.order_by(Task.created_at.desc()).offset(offset).limit(page_size).all()
+    next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id) if has_more else None
     
-    logger.info(f"✅ Returning {len(tasks)} tasks (total: {total})")
+    logger.info("✅ Returning %s tasks (total: %s)", len(tasks), total)
     
-    return TaskListResponse(
-        tasks=[TaskResponse.model_validate(task) for task in tasks],  # Pydantic V2
+    page_data = TaskListResponse.model_construct(
+        tasks=[_task_list_item(task) for task in tasks],  # Trusted DB rows - no per-row validation
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor
     )
+    # Serialize in pydantic-core and hand FastAPI the finished body - the response_model
+    # above stays for the OpenAPI schema, but the validate/serialize pass is skipped
+    return Response(content=page_data.model_dump_json(), media_type="application/json")
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(
+async def get_task(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get single task by ID.
@@ -96,35 +262,23 @@ def get_task(
         404: Task not found
         403: No permission to access task
     """
-    logger.info(f"➡️  Get task {task_id} request from: {current_user.email}")
+    logger.info("➡️  Get task %s request from: %s", task_id, current_user.email)
     
-    # Find task
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        logger.warning(f"⚠️  Task {task_id} not found")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with ID {task_id} not found"
-        )
-    
-    # Check permissions (regular users can only access their tasks)
-    if current_user.role.value != "ADMIN":
-        if task.created_by_id != current_user.id and task.assigned_to_id != current_user.id:
-            logger.warning(f"⚠️  User {current_user.email} denied access to task {task_id}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to access this task"
-            )
+    # Find task (regular users can only access their tasks)
+    task = await _task_for_user(
+        db, task_id, current_user,
+        action="access", denied_detail="You don't have permission to access this task"
+    )
     
-    logger.info(f"✅ Returning task {task_id}")
-    return TaskResponse.model_validate(task)  # Pydantic V2
+    logger.info("✅ Returning task %s", task_id)
+    return _task_response(task)
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create new task.
@@ -133,7 +287,7 @@ def create_task(
         1. Validate input (Pydantic)
         2. Verify assigned_to user exists (if provided)
         3. Create task
-        4. Log creation in audit trail
+        4. Log creation in audit trail (same transaction)
         
     Returns:
         Created task
@@ -142,13 +296,12 @@ def create_task(
         404: Assigned user not found
         500: Database error
     """
-    logger.info(f"➡️  Create task request from: {current_user.email}")
+    logger.info("➡️  Create task request from: %s", current_user.email)
     
     # Verify assigned_to user exists
     if task_data.assigned_to_id:
-        assigned_user = db.query(User).filter(User.id == task_data.assigned_to_id).first()
-        if not assigned_user:
-            logger.warning(f"⚠️  Assigned user {task_data.assigned_to_id} not found")
+        if not await _user_exists(db, task_data.assigned_to_id):
+            logger.warning("⚠️  Assigned user %s not found", task_data.assigned_to_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with ID {task_data.assigned_to_id} not found"
@@ -166,30 +319,31 @@ def create_task(
     
     try:
         db.add(new_task)
-        db.commit()
-        db.refresh(new_task)
-        logger.info(f"✅ Task created: {new_task.id} - {new_task.title}")
+        await db.flush()  # INSERT ... RETURNING now so id/timestamps exist for the audit entry and response
+        
+        # Log creation in audit trail - same transaction, so task and log commit together
+        await log_task_create(db=db, user=current_user, task=new_task, request=request)
         
-        # Log creation in audit trail
-        log_task_create(db=db, user=current_user, task=new_task, request=request)
+        await db.commit()
+        logger.info("✅ Task created: %s - %s", new_task.id, new_task.title)
         
-        return TaskResponse.model_validate(new_task)  # Pydantic V2
+        return _task_response(new_task)
         
     except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Task creation failed: {str(e)}", exc_info=True)
+        await db.rollback()
+        logger.error("❌ Task creation failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create task. Please try again later."
         )
 
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_task(
+async def update_task(
     task_id: UUID,
     task_data: TaskUpdate,
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update existing task.
@@ -200,9 +354,9 @@ def update_task(
     Process:
         1. Find task
         2. Check permissions
-        3. Capture old data
+        3. Capture old values (only fields in the payload)
         4. Update task
-        5. Log changes in audit trail
+        5. Log changes in audit trail (same transaction)
         
     Returns:
         Updated task
@@ -212,71 +366,38 @@ def update_task(
         403: No permission
         500: Database error
     """
-    logger.info(f"➡️  Update task {task_id} request from: {current_user.email}")
+    logger.info("➡️  Update task %s request from: %s", task_id, current_user.email)
     
-    # Find task
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        logger.warning(f"⚠️  Task {task_id} not found")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with ID {task_id} not found"
-        )
+    # Find task the user may update
+    task = await _task_for_user(
+        db, task_id, current_user,
+        action="update", denied_detail="You don't have permission to update this task"
+    )
+    
+    # Only fields the client actually sent - an explicit null is kept (clears
+    # description / unassigns the task), an omitted field is left alone
+    updates = task_data.model_dump(exclude_unset=True)
+    for field in _REQUIRED_TASK_FIELDS:  # NOT NULL columns - null means "no change"
+        if field in updates and updates[field] is None:
+            del updates[field]
     
-    # Check permissions
-    if current_user.role.value != "ADMIN":
-        if task.created_by_id != current_user.id and task.assigned_to_id != current_user.id:
-            logger.warning(f"⚠️  User {current_user.email} denied access to update task {task_id}")
+    # Verify new assigned user exists
+    if updates.get("assigned_to_id") is not None:
+        if not await _user_exists(db, updates["assigned_to_id"]):
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to update this task"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with ID {updates['assigned_to_id']} not found"
             )
     
-    # Capture old data for audit log
-    old_data = {
-        "title": task.title,
-        "description": task.description,
-        "status": task.status.value,
-        "priority": task.priority.value,
-        "assigned_to_id": str(task.assigned_to_id) if task.assigned_to_id else None
-    }
-    
-    # Update fields (only if provided)
-    if task_data.title is not None:
-        task.title = task_data.title
-    if task_data.description is not None:
-        task.description = task_data.description
-    if task_data.status is not None:
-        task.status = task_data.status
-    if task_data.priority is not None:
-        task.priority = task_data.priority
-    if task_data.assigned_to_id is not None:
-        # Verify new assigned user exists
-        if task_data.assigned_to_id:
-            assigned_user = db.query(User).filter(User.id == task_data.assigned_to_id).first()
-            if not assigned_user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"User with ID {task_data.assigned_to_id} not found"
-                )
-        task.assigned_to_id = task_data.assigned_to_id
-    
-    # Capture new data
-    new_data = {
-        "title": task.title,
-        "description": task.description,
-        "status": task.status.value,
-        "priority": task.priority.value,
-        "assigned_to_id": str(task.assigned_to_id) if task.assigned_to_id else None
-    }
+    # Before/after snapshots for the audit log - only fields in the payload can change
+    old_data = {field: _audit_value(getattr(task, field)) for field in updates}
+    for field, value in updates.items():
+        setattr(task, field, value)
+    new_data = {field: _audit_value(getattr(task, field)) for field in updates}
     
     try:
-        db.commit()
-        db.refresh(task)
-        logger.info(f"✅ Task updated: {task_id}")
-        
-        # Log update in audit trail
-        log_task_update(
+        # Log update in audit trail - committed together with the task changes
+        await log_task_update(
             db=db,
             user=current_user,
             task=task,
@@ -285,22 +406,25 @@ def update_task(
             request=request
         )
         
-        return TaskResponse.model_validate(task)  # Pydantic V2
+        await db.commit()  # updated_at is set client-side (onupdate), nothing to reload
+        logger.info("✅ Task updated: %s", task_id)
+        
+        return _task_response(task)
         
     except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Task update failed: {str(e)}", exc_info=True)
+        await db.rollback()
+        logger.error("❌ Task update failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update task. Please try again later."
         )
 
-@router.delete("/{task_id}", status_code=status.HTTP_200_OK)
-def delete_task(
+@router.delete("/{task_id}", response_model=MessageResponse, status_code=status.HTTP_200_OK)
+async def delete_task(
     task_id: UUID,
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete task.
@@ -316,40 +440,28 @@ def delete_task(
         403: No permission
         500: Database error
     """
-    logger.info(f"➡️  Delete task {task_id} request from: {current_user.email}")
+    logger.info("➡️  Delete task %s request from: %s", task_id, current_user.email)
     
-    # Find task
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        logger.warning(f"⚠️  Task {task_id} not found")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with ID {task_id} not found"
-        )
-    
-    # Check permissions
-    if current_user.role.value != "ADMIN":
-        if task.created_by_id != current_user.id:
-            logger.warning(f"⚠️  User {current_user.email} denied access to delete task {task_id}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only delete tasks you created"
-            )
+    # Find task the user may delete (creator only)
+    task = await _task_for_user(
+        db, task_id, current_user,
+        action="delete", denied_detail="You can only delete tasks you created", creator_only=True
+    )
     
     try:
         # Log deletion before removing (need task data for log)
-        log_task_delete(db=db, user=current_user, task=task, request=request)
+        await log_task_delete(db=db, user=current_user, task=task, request=request)
         
-        # Delete task
-        db.delete(task)
-        db.commit()
-        logger.info(f"✅ Task deleted: {task_id}")
+        # Delete task - one commit for the DELETE and its audit entry
+        await db.delete(task)
+        await db.commit()
+        logger.info("✅ Task deleted: %s", task_id)
         
-        return {"message": "Task deleted successfully"}
+        return MessageResponse(message="Task deleted successfully")
         
     except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Task deletion failed: {str(e)}", exc_info=True)
+        await db.rollback()
+        logger.error("❌ Task deletion failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete task. Please try again later."
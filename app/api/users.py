@@ -2,27 +2,34 @@
 Users API - User management endpoints (admin only)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, update, func, lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from uuid import UUID
 import logging
 
 from app.database import get_db
 from app.schemas import UserResponse
-from app.models import User
-from app.core.dependencies import get_current_admin_user
+from app.models import User, UserRole
+from app.core.dependencies import get_current_admin_user, invalidate_cached_user
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Validates a whole page of ORM rows in one pydantic-core call
+_USERS_ADAPTER = TypeAdapter(List[UserResponse])
+
 @router.get("", response_model=List[UserResponse])  # Use List from typing
-def get_all_users(
+async def get_all_users(
+    response: Response,  # Used to expose the optional total via header
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    include_total: bool = Query(False, description="Return total count in X-Total-Count header (extra COUNT query)"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     current_admin: User = Depends(get_current_admin_user),  # Admin only
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all users (admin only).
@@ -30,36 +37,45 @@ def get_all_users(
     Query parameters:
         - page: Page number
         - page_size: Items per page (max 100)
+        - include_total: Set X-Total-Count response header (off by default)
         - is_active: Filter by active status
         
     Returns:
         List of UserResponse
     """
-    logger.info(f"➡️  Get all users request from admin: {current_admin.email}")
+    logger.info("➡️  Get all users request from admin: %s", current_admin.email)
     
-    # Build query
-    query = db.query(User)
+    # Build queries as lambda statements - SQL is compiled once per filter
+    # combination and cached; values are bound at execute time
+    query = lambda_stmt(lambda: select(User))
+    count_query = lambda_stmt(lambda: select(func.count()).select_from(User))
     
     # Apply filter
     if is_active is not None:
-        query = query.filter(User.is_active == is_active)
+        query += lambda s: s.where(User.is_active == is_active)
+        count_query += lambda s: s.where(User.is_active == is_active)
     
-    # Get total
-    total = query.count()
+    # Get total only when asked - skips a full COUNT on every page
+    total = None
+    if include_total:
+        total = (await db.execute(count_query)).scalar_one()
+        response.headers["X-Total-Count"] = str(total)
     
     # Apply pagination
     offset = (page - 1) * page_size
-    users = query.order_by(User.created_at.desc()).offset(offset).limit(page_size).all()
+    query += lambda s: s.order_by(User.created_at.desc()).offset(offset).limit(page_size)
+    result = await db.execute(query)
+    users = result.scalars().all()
     
-    logger.info(f"✅ Returning {len(users)} users (total: {total})")
+    logger.info("✅ Returning %s users (total: %s)", len(users), total)
     
-    return [UserResponse.model_validate(user) for user in users]  # Pydantic V2
+    return _USERS_ADAPTER.validate_python(users, from_attributes=True)  # Pydantic V2 batch validation
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user_by_id(
+async def get_user_by_id(
     user_id: UUID,
     current_admin: User = Depends(get_current_admin_user),  # Admin only
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get user by ID (admin only).
@@ -70,25 +86,25 @@ def get_user_by_id(
     Raises:
         404: User not found
     """
-    logger.info(f"➡️  Get user {user_id} request from admin: {current_admin.email}")
+    logger.info("➡️  Get user %s request from admin: %s", user_id, current_admin.email)
     
     # Find user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)  # PK lookup - identity map first, then direct SELECT
     if not user:
-        logger.warning(f"⚠️  User {user_id} not found")
+        logger.warning("⚠️  User %s not found", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
     
-    logger.info(f"✅ Returning user {user_id}")
+    logger.info("✅ Returning user %s", user_id)
     return UserResponse.model_validate(user)  # Pydantic V2
 
 @router.patch("/{user_id}/deactivate", response_model=UserResponse)
-def deactivate_user(
+async def deactivate_user(
     user_id: UUID,
     current_admin: User = Depends(get_current_admin_user),  # Admin only
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Deactivate user account (admin only).
@@ -103,46 +119,50 @@ def deactivate_user(
         404: User not found
         400: Cannot deactivate admin
     """
-    logger.info(f"➡️  Deactivate user {user_id} request from admin: {current_admin.email}")
+    logger.info("➡️  Deactivate user %s request from admin: %s", user_id, current_admin.email)
     
-    # Find user
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        logger.warning(f"⚠️  User {user_id} not found")
+    # Deactivate in one round trip - RETURNING gives fresh state (no refresh needed),
+    # and the role condition enforces "cannot deactivate admin" atomically in the DB
+    try:
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id, User.role != UserRole.ADMIN)
+            .values(is_active=False)
+            .returning(User)
+        )
+        user = result.scalar_one_or_none()
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error("❌ Failed to deactivate user: %s", e, exc_info=True)
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {user_id} not found"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to deactivate user"
         )
     
-    # Cannot deactivate admin users
-    if user.role.value == "ADMIN":
-        logger.warning(f"⚠️  Attempted to deactivate admin user {user_id}")
+    # Nothing updated - look the user up only now to tell 404 from 400
+    if not user:
+        if await db.get(User, user_id) is None:
+            logger.warning("⚠️  User %s not found", user_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with ID {user_id} not found"
+            )
+        logger.warning("⚠️  Attempted to deactivate admin user %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot deactivate admin users"
         )
     
-    # Deactivate
-    user.is_active = False
-    
-    try:
-        db.commit()
-        db.refresh(user)
-        logger.info(f"✅ User {user_id} deactivated")
-        return UserResponse.model_validate(user)  # Pydantic V2
-    except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Failed to deactivate user: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to deactivate user"
-        )
+    invalidate_cached_user(user_id)  # Status change must take effect on next request
+    logger.info("✅ User %s deactivated", user_id)
+    return UserResponse.model_validate(user)  # Pydantic V2
 
 @router.patch("/{user_id}/activate", response_model=UserResponse)
-def activate_user(
+async def activate_user(
     user_id: UUID,
     current_admin: User = Depends(get_current_admin_user),  # Admin only
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Activate user account (admin only).
@@ -155,29 +175,33 @@ def activate_user(
     Raises:
         404: User not found
     """
-    logger.info(f"➡️  Activate user {user_id} request from admin: {current_admin.email}")
+    logger.info("➡️  Activate user %s request from admin: %s", user_id, current_admin.email)
+    
+    # Activate in one round trip - RETURNING gives fresh state (no refresh needed)
+    try:
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(is_active=True)
+            .returning(User)
+        )
+        user = result.scalar_one_or_none()
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error("❌ Failed to activate user: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to activate user"
+        )
     
-    # Find user
-    user = db.query(User).filter(User.id == user_id).first()
     if not user:
-        logger.warning(f"⚠️  User {user_id} not found")
+        logger.warning("⚠️  User %s not found", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
     
-    # Activate
-    user.is_active = True
-    
-    try:
-        db.commit()
-        db.refresh(user)
-        logger.info(f"✅ User {user_id} activated")
-        return UserResponse.model_validate(user)  # Pydantic V2
-    except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Failed to activate user: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to activate user"
-        )
\ No newline at end of file
+    invalidate_cached_user(user_id)  # Status change must take effect on next request
+    logger.info("✅ User %s activated", user_id)
+    return UserResponse.model_validate(user)  # Pydantic V2
@@ -0,0 +1,95 @@
+"""
+Cache Module - Redis client and cache-aside helpers
+
+Redis is an optimization, not a dependency: if it is unreachable every helper
+falls back to computing the value directly so the API keeps working.
+"""
+
+from typing import Awaitable, Callable, Optional
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared client - created on startup, connection pool is managed by redis-py
+_redis: Optional[redis.Redis] = None
+
+def init_redis() -> None:
+    """Create the shared Redis client (called on application startup)."""
+    global _redis
+    _redis = redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,  # Never let a slow cache stall a request
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        decode_responses=True,  # Cached values are JSON strings
+    )
+    logger.info("✅ Redis client initialized")
+
+async def close_redis() -> None:
+    """Close the shared Redis client (called on application shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+        logger.info("✅ Redis client closed")
+
+def get_redis() -> Optional[redis.Redis]:
+    """Return the shared Redis client, or None if caching is not initialized."""
+    return _redis
+
+async def cached_json(key: str, ttl: int, compute: Callable[[], Awaitable[str]]) -> str:
+    """
+    Cache-aside lookup for a JSON string with stampede protection.
+
+    Process:
+        1. Return fresh value from Redis if present
+        2. Otherwise one caller takes a short SET NX lock and recomputes
+        3. Callers that lose the lock serve the last (stale) value instead
+           of piling onto the database; if there is none they compute too
+
+    Args:
+        key: Redis key for the fresh value
+        ttl: Seconds the fresh value stays valid
+        compute: Coroutine factory producing the JSON string on cache miss
+
+    Returns:
+        JSON string (from cache or freshly computed)
+    """
+    r = get_redis()
+    if r is None:
+        return await compute()
+
+    stale_key = f"{key}:stale"
+    lock_key = f"{key}:lock"
+
+    try:
+        cached = await r.get(key)
+        if cached is not None:
+            return cached
+
+        have_lock = bool(await r.set(lock_key, "1", nx=True, ex=max(ttl, 5)))
+        if not have_lock:  # Someone else is refreshing - serve stale if we can
+            stale = await r.get(stale_key)
+            if stale is not None:
+                return stale
+    except RedisError as e:
+        logger.warning("⚠️  Redis unavailable, computing %s directly: %s", key, e)
+        return await compute()
+
+    try:
+        value = await compute()
+        try:
+            await r.set(key, value, ex=ttl)
+            await r.set(stale_key, value, ex=ttl * 10)  # Kept longer so lock losers have something to serve
+        except RedisError as e:
+            logger.warning("⚠️  Failed to cache %s: %s", key, e)
+        return value
+    finally:
+        if have_lock:
+            try:
+                await r.delete(lock_key)
+            except RedisError:
+                pass  # Lock expires on its own
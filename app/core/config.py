@@ -13,7 +13,7 @@ SECURITY NOTES:
 - SECRET_KEY should be 32+ random characters
 """
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List, Optional
 from functools import lru_cache
 
@@ -33,6 +33,8 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     ENVIRONMENT: str = "development"  # development, staging, production
     DEBUG: bool = True
+    ACCESS_LOG: bool = False  # App-level request logging outside DEBUG (uvicorn's access log covers production)
+    HEALTH_CACHE_TTL: float = 1.0  # Seconds a /health result is reused across probes
     
     # ============================================
     # DATABASE SETTINGS
@@ -46,6 +48,10 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 10  # Max number of connections to keep open
     DB_MAX_OVERFLOW: int = 20  # Additional connections when pool is full
     DB_POOL_TIMEOUT: int = 30  # Seconds to wait for available connection
+    DB_POOL_RECYCLE: int = 300  # Seconds before a connection is replaced (also retires connections before idle timeouts drop them)
+    DB_POOL_PRE_PING: bool = False  # SELECT 1 on every checkout - off: a stale connection fails one request (no retry) before the pool recovers
+    DB_STATEMENT_CACHE_SIZE: int = 500  # Prepared statements kept per connection (0 disables - needed behind pgbouncer transaction pooling)
+    DB_QUERY_CACHE_SIZE: int = 1200  # SQLAlchemy compiled-SQL LRU cache entries (shared by the engine)
     
     # ============================================
     # SECURITY SETTINGS
@@ -56,8 +62,20 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     
     # Password hashing
-    # WHY: bcrypt with high cost factor protects against brute force
-    BCRYPT_ROUNDS: int = 12  # Higher = more secure but slower
+    # WHY: argon2id is memory-hard (resists GPU cracking) and cheaper on CPU than bcrypt-12
+    ARGON2_TIME_COST: int = 2  # Iterations
+    ARGON2_MEMORY_COST: int = 65536  # KiB (64 MiB)
+    ARGON2_PARALLELISM: int = 1  # Lanes - keep 1 so concurrent logins use separate cores
+    BCRYPT_ROUNDS: int = 12  # Only used to verify legacy bcrypt hashes (upgraded on login)
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Hashing threads (None = CPU count)
+    
+    # Verified JWT cache (skips signature verification for repeat tokens)
+    TOKEN_CACHE_TTL: int = 30  # Seconds a verified token payload is reused
+    TOKEN_CACHE_MAXSIZE: int = 10000  # Max cached tokens per worker
+    
+    # Authenticated user cache (skips the user lookup on every request)
+    USER_CACHE_TTL: int = 60  # Seconds a cached user may be stale
+    USER_CACHE_MAXSIZE: int = 10000  # Max cached users per worker
     
     # ============================================
     # CORS SETTINGS
@@ -69,11 +87,18 @@ class Settings(BaseSettings):
     ]
     # In production, replace with actual domain: ["https://app.yourdomain.com"]
     
+    # Response compression (GZipMiddleware)
+    GZIP_MINIMUM_SIZE: int = 1024  # Responses smaller than this are not compressed
+    GZIP_LEVEL: int = 5  # Compression level (1 fastest - 9 smallest)
+    
     # ============================================
     # REDIS SETTINGS (for caching and rate limiting)
     # ============================================
     REDIS_URL: str = "redis://localhost:6379"
     REDIS_TTL: int = 3600  # Cache TTL in seconds (1 hour)
+    REDIS_SOCKET_TIMEOUT: float = 0.5  # Seconds - fall back to DB rather than wait on a slow cache
+    AUDIT_STATS_CACHE_TTL: int = 30  # Seconds - dashboard stats may be this stale
+    HTTP_CACHE_MAX_AGE: int = 30  # Seconds clients may reuse /stats and first-page history (Cache-Control)
     
     # ============================================
     # RATE LIMITING
@@ -95,17 +120,16 @@ class Settings(BaseSettings):
     MAX_TASK_TITLE_LENGTH: int = 200
     MAX_TASK_DESCRIPTION_LENGTH: int = 5000
     
-    class Config:
-        """
-        Pydantic configuration for environment variable loading.
-        
-        WHY env_file:
-        - Loads variables from .env file automatically
-        - Keeps secrets out of code
-        - Easy to change between environments
-        """
-        env_file = ".env"
-        case_sensitive = True  # DATABASE_URL != database_url
+    # Pydantic configuration for environment variable loading.
+    #
+    # WHY env_file:
+    # - Loads variables from .env file automatically
+    # - Keeps secrets out of code
+    # - Easy to change between environments
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,  # DATABASE_URL != database_url
+    )
 
 
 @lru_cache()
@@ -176,7 +200,8 @@ def validate_config():
         print("⚠️  WARNING: DEBUG=True in production is a security risk!")
     
     # Validate DATABASE_URL format
-    if not settings.DATABASE_URL.startswith("postgresql://"):
+    # (driver suffixes like postgresql+asyncpg:// are fine - database.py swaps in asyncpg anyway)
+    if not settings.DATABASE_URL.startswith(("postgresql://", "postgresql+", "postgres://")):
         raise ValueError(
             "DATABASE_URL must start with postgresql:// "
             f"Got: {settings.DATABASE_URL[:20]}..."
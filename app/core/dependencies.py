@@ -4,11 +4,14 @@ FastAPI Dependencies - Reusable dependency injection functions
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
 from typing import Optional
+from uuid import UUID
 import logging
 
 from app.database import get_db
+from app.core.config import settings
 from app.core.security import decode_token
 from app.models import User, UserRole
 
@@ -17,9 +20,42 @@ logger = logging.getLogger(__name__)
 # HTTP Bearer token scheme - expects "Authorization: Bearer <token>" header
 security = HTTPBearer()
 
-def get_current_user(
+# Same scheme but returns None instead of 403 when the header is missing
+optional_security = HTTPBearer(auto_error=False)
+
+# Short-lived cache of authenticated users keyed by user ID (token "sub")
+# Saves one SELECT per authenticated request; entries are detached User objects
+_user_cache: TTLCache = TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL)
+
+async def _load_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """
+    Look up a user by token subject, serving from the TTL cache when possible.
+    
+    Returns:
+        Detached User object (active or not), or None if no such user
+    """
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await db.get(User, UUID(user_id))  # PK lookup
+        if user is None:
+            return None
+        db.expunge(user)  # Detach so this session's commit/rollback can't expire the cached copy
+        _user_cache[user_id] = user
+    return user
+
+def invalidate_cached_user(user_id) -> None:
+    """
+    Drop a user from the authentication cache.
+    
+    Call after changing anything get_current_user relies on (is_active, role)
+    or returns to clients (e.g. last_login), so the next request reloads it.
+    Per-process only - other workers pick up the change when their entry expires.
+    """
+    _user_cache.pop(str(user_id), None)
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),  # Extract token from Authorization header
-    db: Session = Depends(get_db)  # Get database session
+    db: AsyncSession = Depends(get_db)  # Get database session
 ) -> User:
     """
     Dependency to get currently authenticated user from JWT token.
@@ -28,7 +64,7 @@ def get_current_user(
         1. Extract token from Authorization header
         2. Verify token signature and expiration
         3. Extract user ID from token payload
-        4. Fetch user from database
+        4. Fetch user from cache or database
         5. Verify user is active
         
     Returns:
@@ -39,7 +75,7 @@ def get_current_user(
         
     Usage in endpoints:
         @app.get("/protected")
-        def protected_route(current_user: User = Depends(get_current_user)):
+        async def protected_route(current_user: User = Depends(get_current_user)):
             return {"user": current_user.email}
     """
     # Extract token from credentials
@@ -55,10 +91,10 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},  # Tell client to use Bearer auth
         )
     
-    # Fetch user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Fetch user from cache, falling back to database
+    user = await _load_user(db, user_id)
     if not user:
-        logger.warning(f"⚠️  Token valid but user {user_id} not found")
+        logger.warning("⚠️  Token valid but user %s not found", user_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
@@ -66,16 +102,16 @@ def get_current_user(
     
     # Check if user account is active
     if not user.is_active:
-        logger.warning(f"⚠️  Inactive user {user.email} attempted access")
+        logger.warning("⚠️  Inactive user %s attempted access", user.email)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive",
         )
     
-    logger.debug(f"✅ Authenticated user: {user.email}")
+    logger.debug("✅ Authenticated user: %s", user.email)
     return user  # Return user object for use in endpoint
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: User = Depends(get_current_user)  # Reuse get_current_user dependency
 ) -> User:
     """
@@ -84,12 +120,12 @@ def get_current_active_user(
     
     Usage:
         @app.get("/profile")
-        def get_profile(user: User = Depends(get_current_active_user)):
+        async def get_profile(user: User = Depends(get_current_active_user)):
             return user
     """
     return current_user  # get_current_user already checks is_active
 
-def get_current_admin_user(
+async def get_current_admin_user(
     current_user: User = Depends(get_current_user)  # Get authenticated user
 ) -> User:
     """
@@ -105,23 +141,23 @@ def get_current_admin_user(
         
     Usage:
         @app.get("/admin/audit-logs")
-        def get_all_audit_logs(admin: User = Depends(get_current_admin_user)):
+        async def get_all_audit_logs(admin: User = Depends(get_current_admin_user)):
             # Only admins can access this
             return audit_logs
     """
-    if current_user.role != UserRole.ADMIN:
-        logger.warning(f"⚠️  Non-admin user {current_user.email} attempted admin access")
+    if current_user.role is not UserRole.ADMIN:
+        logger.warning("⚠️  Non-admin user %s attempted admin access", current_user.email)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
         )
     
-    logger.debug(f"✅ Admin access granted to {current_user.email}")
+    logger.debug("✅ Admin access granted to %s", current_user.email)
     return current_user
 
-def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),  # Token optional
-    db: Session = Depends(get_db)
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),  # Token optional
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """
     Dependency for endpoints that work with or without authentication.
@@ -133,7 +169,7 @@ def get_optional_user(
     
     Usage:
         @app.get("/public-but-personalized")
-        def endpoint(user: Optional[User] = Depends(get_optional_user)):
+        async def endpoint(user: Optional[User] = Depends(get_optional_user)):
             if user:
                 return {"message": f"Hello {user.email}"}
             return {"message": "Hello anonymous user"}
@@ -147,5 +183,5 @@ def get_optional_user(
     if not user_id:
         return None  # Invalid token - treat as anonymous
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await _load_user(db, user_id)  # Shares the get_current_user cache
     return user if user and user.is_active else None  # Return user or None
\ No newline at end of file
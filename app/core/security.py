@@ -2,31 +2,42 @@
 Security Module - Handles password hashing and JWT token generation/validation
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import os
+import threading
+import time
 import logging
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Password hashing context - bcrypt with configurable cost factor
+# Password hashing context - argon2id for new hashes, bcrypt kept to verify existing ones
 pwd_context = CryptContext(
-    schemes=["bcrypt"],  # Use bcrypt algorithm (industry standard)
-    deprecated="auto",  # Automatically upgrade old hashes
-    bcrypt__rounds=settings.BCRYPT_ROUNDS  # Cost factor (higher = more secure but slower)
+    schemes=["argon2", "bcrypt"],  # First scheme is used for new hashes
+    deprecated="auto",  # Every scheme but the first is deprecated -> needs_update() flags it
+    argon2__type="ID",  # argon2id (hybrid of data-independent/-dependent passes)
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+    bcrypt__rounds=settings.BCRYPT_ROUNDS  # Cost factor of legacy hashes
 )
 
 def hash_password(password: str) -> str:
     """
-    Hash a plaintext password using bcrypt.
+    Hash a plaintext password using argon2id.
     
     Security notes:
     - Never store passwords in plaintext
-    - bcrypt automatically adds salt (prevents rainbow table attacks)
-    - Cost factor of 12 takes ~0.3 seconds (acceptable UX, strong security)
+    - argon2 automatically adds salt (prevents rainbow table attacks)
+    - Memory-hard: each guess costs 64 MiB, which cripples GPU/ASIC cracking
     
     Args:
         password: Plaintext password from user input
@@ -36,13 +47,13 @@ def hash_password(password: str) -> str:
         
     Example:
         hashed = hash_password("MySecurePass123!")
-        # Returns: $2b$12$abc...xyz (60 characters)
+        # Returns: $argon2id$v=19$m=65536,t=2,p=1$...
     """
-    return pwd_context.hash(password)  # Generate bcrypt hash with salt
+    return pwd_context.hash(password)  # Generate argon2id hash with salt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a plaintext password against a bcrypt hash.
+    Verify a plaintext password against a stored hash (argon2id or legacy bcrypt).
     
     Args:
         plain_password: Password provided by user during login
@@ -63,9 +74,63 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         return pwd_context.verify(plain_password, hashed_password)  # Constant-time comparison
     except Exception as e:
-        logger.error(f"❌ Password verification error: {str(e)}")
+        logger.error("❌ Password verification error: %s", e)
         return False  # If hash is corrupted, deny access
 
+# Dedicated pool for password hashing - argon2/bcrypt release the GIL, so logins run
+# in parallel across cores without competing with the default threadpool (sync deps, file I/O)
+_hash_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count(),
+    thread_name_prefix="password-hash"
+)
+
+async def ahash_password(password: str) -> str:
+    """Async hash_password() - runs on the hashing pool so the event loop never blocks."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, hash_password, password)
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Async verify_password() - runs on the hashing pool so the event loop never blocks."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_pool, verify_password, plain_password, hashed_password
+    )
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash uses a deprecated scheme or outdated parameters.
+    
+    Call after a successful verify_password() - the plaintext is at hand then,
+    so the hash can be upgraded transparently (e.g. bcrypt -> argon2id).
+    
+    Returns:
+        True if the hash should be replaced with hash_password(plain)
+    """
+    try:
+        return pwd_context.needs_update(hashed_password)
+    except ValueError:
+        return False  # Unrecognized hash - verify_password already rejected it
+
+# Hash of a random throwaway password, computed once at import with the current
+# parameters. Verifying against it costs the same as a real login check.
+_DUMMY_HASH = pwd_context.hash(os.urandom(16).hex())
+
+def dummy_verify() -> None:
+    """
+    Burn one password verification for a login whose email doesn't exist.
+    
+    Without it, unknown emails return immediately while known ones pay for
+    argon2 - the response time would reveal which emails are registered.
+    """
+    pwd_context.verify("dummy", _DUMMY_HASH)
+
+async def adummy_verify() -> None:
+    """Async dummy_verify() - runs on the hashing pool like a real verification."""
+    await asyncio.get_running_loop().run_in_executor(_hash_pool, dummy_verify)
+
+# Verified token payloads keyed by SHA-256 of the token - repeat requests with the
+# same token skip the HMAC verify + JSON decode. Only successes are cached.
+_token_cache: TTLCache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()  # cachetools caches are not thread-safe
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token for authentication.
@@ -95,9 +160,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     
     # Set expiration time
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta  # Custom expiration
+        expire = datetime.now(timezone.utc) + expires_delta  # Custom expiration
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)  # Default: 24 hours
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)  # Default: 24 hours
     
     to_encode.update({"exp": expire})  # Add expiration claim to payload
     
@@ -108,7 +173,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         algorithm=settings.ALGORITHM  # HS256 (HMAC-SHA256)
     )
     
-    logger.debug(f"✅ Created access token expiring at {expire}")
+    logger.debug("✅ Created access token expiring at %s", expire)
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[dict]:
@@ -126,6 +191,9 @@ def verify_token(token: str) -> Optional[dict]:
         2. Token not expired
         3. Algorithm matches expected (prevents algorithm confusion attacks)
         
+    Successfully verified payloads are cached briefly (see _token_cache), so
+    repeat requests with the same token only re-check expiry.
+        
     Example:
         payload = verify_token(token_from_header)
         if payload:
@@ -134,6 +202,16 @@ def verify_token(token: str) -> Optional[dict]:
         else:
             # Return 401 Unauthorized
     """
+    # Fast path: token already verified recently (and not expired since)
+    key = hashlib.sha256(token.encode()).digest()
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        with _token_cache_lock:
+            _token_cache.pop(key, None)  # Expired while cached - fall through to full verify
+    
     try:
         # Decode and verify token
         payload = jwt.decode(
@@ -141,6 +219,11 @@ def verify_token(token: str) -> Optional[dict]:
             settings.SECRET_KEY,  # Verify signature with this key
             algorithms=[settings.ALGORITHM]  # Only accept HS256 (prevent algorithm switching)
         )
+        # Cache only verified tokens - invalid ones must keep failing the full check.
+        # Entries live at most TOKEN_CACHE_TTL, and the exp check above covers tokens
+        # expiring sooner than that.
+        with _token_cache_lock:
+            _token_cache[key] = payload
         return payload  # Token is valid, return payload
         
     except jwt.ExpiredSignatureError:
@@ -148,11 +231,11 @@ def verify_token(token: str) -> Optional[dict]:
         return None
         
     except JWTError as e:
-        logger.warning(f"⚠️  Invalid token: {str(e)}")  # Signature invalid or malformed
+        logger.warning("⚠️  Invalid token: %s", e)  # Signature invalid or malformed
         return None
         
     except Exception as e:
-        logger.error(f"❌ Token verification error: {str(e)}")  # Unexpected error
+        logger.error("❌ Token verification error: %s", e)  # Unexpected error
         return None
 
 def decode_token(token: str) -> Optional[str]:
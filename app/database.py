@@ -2,47 +2,83 @@
 Database Session Management - Core database connectivity layer
 """
 
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import event, text, select, func
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator
 import logging
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Create database engine with connection pooling
-engine = create_engine(
-    settings.DATABASE_URL,  # PostgreSQL connection string from environment
+def _async_database_url(database_url: str) -> URL:
+    """
+    Point DATABASE_URL at the asyncpg driver.
+    
+    Accepts plain postgresql://, Heroku-style postgres:// and URLs that already
+    name a driver (postgresql+psycopg2://, postgresql+asyncpg://), so the same
+    .env works for the app, psql and migration tooling.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() in ("postgres", "postgresql"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url
+
+# Create async database engine with connection pooling
+# asyncpg driver keeps DB I/O on the event loop instead of blocking threadpool workers
+engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),  # PostgreSQL connection string from environment
     pool_size=settings.DB_POOL_SIZE,  # Number of persistent connections
     max_overflow=settings.DB_MAX_OVERFLOW,  # Additional connections when pool is exhausted
     pool_timeout=settings.DB_POOL_TIMEOUT,  # Wait time for available connection
-    pool_pre_ping=True,  # Verify connection health before using (prevents stale connections)
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Replace connections older than this
+    pool_use_lifo=True,  # Reuse the most recently returned (warm) connection; idle extras time out
+    # No ping round trip per checkout: pool_recycle retires connections before server/proxy
+    # idle timeouts close them, and handle_error below deals with the rare dead one
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    # Compiled SQL is cached by statement structure, so the same query text reaches asyncpg
+    # each time and its per-connection prepared statement is reused (no parse/plan per call)
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args={
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,  # SQLAlchemy's asyncpg adapter cache
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,  # asyncpg's own cache (raw connection use)
+    },
     echo=settings.DEBUG,  # Log all SQL queries in debug mode
 )
 
 # Log when new database connections are established (debugging aid)
-@event.listens_for(engine, "connect")
+@event.listens_for(engine.sync_engine, "connect")
 def receive_connect(dbapi_conn, connection_record):
     logger.debug("🔌 New database connection established")
 
 # Log when connections are closed (track connection lifecycle)
-@event.listens_for(engine, "close")
+@event.listens_for(engine.sync_engine, "close")
 def receive_close(dbapi_conn, connection_record):
     logger.debug("🔌 Database connection closed")
 
+# Log dead connections (DB restart, failover, dropped TCP). Recovery is SQLAlchemy's
+# default behaviour: it invalidates the whole pool so stale connections are replaced
+# on next checkout. Nothing is retried - with pool_pre_ping off, the request that hit
+# the dead connection fails (500) and later requests get fresh connections.
+# Set DB_POOL_PRE_PING=True if even that one failed request is unacceptable.
+@event.listens_for(engine.sync_engine, "handle_error")
+def receive_handle_error(context):
+    if context.is_disconnect:
+        logger.warning("⚠️  Database disconnect detected - connection pool will be invalidated: %s", context.original_exception)
+
 # Session factory - creates new sessions for each request
-SessionLocal = sessionmaker(
-    autocommit=False,  # Require explicit commits (safer, prevents accidental data changes)
+SessionLocal = async_sessionmaker(
     autoflush=False,   # Control when changes are flushed to database
+    expire_on_commit=False,  # Keep loaded attributes after commit (no implicit async lazy-loads)
     bind=engine,       # Bind sessions to our configured engine
 )
 
 # Base class for all SQLAlchemy models - provides metadata and table registry
 Base = declarative_base()
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency that provides database session per request.
     Automatically handles session lifecycle and cleanup.
@@ -51,40 +87,50 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db  # Provide session to endpoint
     except Exception as e:
-        logger.error(f"❌ Database error during request: {str(e)}", exc_info=True)  # Log full stack trace
-        db.rollback()  # Rollback failed transaction to prevent partial commits
+        logger.error("❌ Database error during request: %s", e, exc_info=True)  # Log full stack trace
+        await db.rollback()  # Rollback failed transaction to prevent partial commits
         raise  # Re-raise exception to FastAPI for proper HTTP error response
     finally:
-        db.close()  # Always close session (prevents connection leaks)
+        await db.close()  # Always close session (prevents connection leaks)
         logger.debug("✅ Database session closed")
 
-def init_db() -> None:
+async def count_rows(db: AsyncSession, stmt) -> int:
+    """
+    Count rows a SELECT statement would return (wraps it in a subquery).
+    Used by list endpoints that report a total.
+    """
+    result = await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))
+    return result.scalar_one()
+
+async def init_db() -> None:
     """
     Initialize database by creating all tables.
     Used for development setup - production should use Alembic migrations.
     """
     logger.info("🏗️  Creating database tables...")
     try:
-        from app.models import user, task, audit_log  # Import models to register with Base
-        Base.metadata.create_all(bind=engine)  # Create all tables defined in models
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)  # Create all tables defined in models
         logger.info("✅ Database tables created successfully")
     except Exception as e:
-        logger.error(f"❌ Failed to create database tables: {str(e)}", exc_info=True)
+        logger.error("❌ Failed to create database tables: %s", e, exc_info=True)
         raise  # Fail fast - app shouldn't start without database
 
-def check_db_connection() -> bool:
+# Connectivity probe - built once, reused by every health check
+_PING = text("SELECT 1")
+
+async def check_db_connection() -> bool:
     """
     Verify database connectivity - used for health checks and startup validation.
     Returns True if connection successful, False otherwise.
     """
     try:
-        db = SessionLocal()  # Attempt to create session
-        db.execute(text("SELECT 1")) # Execute simple query to verify connectivity
-        db.close()  # Clean up test session
+        async with engine.connect() as conn:  # Plain pooled connection - no ORM session needed
+            await conn.execute(_PING)  # Execute simple query to verify connectivity
         logger.info("✅ Database connection successful")
         return True
     except Exception as e:
-        logger.error(f"❌ Database connection failed: {str(e)}", exc_info=True)
+        logger.error("❌ Database connection failed: %s", e, exc_info=True)
         return False
 
 def get_pool_stats() -> dict:
@@ -100,11 +146,15 @@ def get_pool_stats() -> dict:
         "checked_in": pool.checkedin(),  # Idle connections in pool
     }
 
-def close_db_connections():
+async def close_db_connections():
     """
     Gracefully close all database connections.
     Called during application shutdown to prevent "too many connections" errors.
     """
     logger.info("🔌 Closing database connections...")
-    engine.dispose()  # Close all connections in pool
-    logger.info("✅ All database connections closed")
\ No newline at end of file
+    await engine.dispose()  # Close all connections in pool
+    logger.info("✅ All database connections closed")
+
+# Register all models on Base.metadata as soon as the database layer is imported
+# (bottom of module: models import Base from here, so it must already exist)
+import app.models  # noqa: E402,F401
@@ -2,17 +2,20 @@
 FastAPI Application Entry Point - Application initialization and configuration
 """
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
+import asyncio
 import logging
 import sys
 import time
 
 from app.core.config import settings, validate_config, is_production
 from app.database import check_db_connection, close_db_connections, get_pool_stats
+from app.core.cache import init_redis, close_redis
 
 # Configure application logging with timestamp and log level
 logging.basicConfig(
@@ -34,6 +37,9 @@ def create_application() -> FastAPI:
         docs_url="/api/docs" if not is_production() else None,  # Hide Swagger docs in production
         redoc_url="/api/redoc" if not is_production() else None,  # Hide ReDoc in production
         description="Production-grade audit trail management system"
+        # No default_response_class on purpose: with the default JSONResponse, FastAPI
+        # serializes response_model endpoints straight to JSON bytes in pydantic-core;
+        # a custom class (e.g. ORJSONResponse) would opt every route out of that path
     )
     
     setup_middleware(app)  # Configure CORS and request logging
@@ -55,7 +61,7 @@ def setup_routers(app: FastAPI) -> None:
 
     @app.get("/health", tags=["Health"])
     async def health_check():
-        db_healthy = check_db_connection()
+        db_healthy = await check_db_connection()
         pool_stats = get_pool_stats()
 
         return {
@@ -78,41 +84,68 @@ def setup_middleware(app: FastAPI) -> None:
         allow_headers=["*"],  # Allow all request headers
     )
     
-    # Request timing and logging middleware
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        """Log every request with method, path, status, and processing time"""
-        start_time = time.time()  # Record request start time
-        logger.info(f"➡️  {request.method} {request.url.path}")  # Log incoming request
-        
-        response = await call_next(request)  # Process request through handlers
-        
-        process_time = time.time() - start_time  # Calculate total processing time
-        logger.info(
-            f"⬅️  {request.method} {request.url.path} "
-            f"- Status: {response.status_code} - Time: {process_time:.2f}s"
-        )
-        response.headers["X-Process-Time"] = str(process_time)  # Add timing header for debugging
-        return response
+    # Response compression - audit log pages repeat the same keys/values on every row,
+    # so JSON lists compress ~10x; small bodies are sent as-is (not worth the CPU)
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.GZIP_MINIMUM_SIZE,  # Bytes - skip compression below this
+        compresslevel=settings.GZIP_LEVEL,  # 1-9; mid levels give most of the ratio for a fraction of level 9's CPU
+    )
+    
+    # Request timing and logging middleware - development / opt-in only.
+    # Each HTTP middleware adds an extra async frame per request; in production
+    # uvicorn's access log already records method, path and status.
+    if settings.DEBUG or settings.ACCESS_LOG:
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            """Log every request with method, path, status, and processing time"""
+            start = time.perf_counter()  # Monotonic high-resolution clock (no syscall, safe for deltas)
+            log_enabled = logger.isEnabledFor(logging.INFO)  # Skip all log formatting when INFO is off
+            if log_enabled:
+                logger.info("➡️  %s %s", request.method, request.url.path)  # Log incoming request
+            
+            response = await call_next(request)  # Process request through handlers
+            
+            elapsed = f"{(time.perf_counter() - start) * 1000:.1f}ms"  # Format once for log and header
+            if log_enabled:
+                logger.info(
+                    "⬅️  %s %s - Status: %s - Time: %s",
+                    request.method, request.url.path, response.status_code, elapsed
+                )
+            response.headers["X-Process-Time"] = elapsed  # Add timing header for debugging
+            return response
 
 def setup_exception_handlers(app: FastAPI) -> None:
-    """Configure global exception handlers for consistent error responses"""
+    """
+    Configure global exception handlers for consistent error responses.
+    
+    Handlers build small dicts of primitives, so plain JSONResponse is kept -
+    FastAPI's ORJSONResponse is deprecated and would add a dependency for no gain.
+    """
     
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         """
         Handle Pydantic validation errors (invalid request data).
         Returns field-level error details for better debugging.
+        
+        FastAPI already collects these with include_url=False. The raw dicts still
+        carry "input" (echoes the request body back) and "ctx" (may hold exception
+        objects that need jsonable_encoder), so only the three public keys are
+        copied out in a single comprehension.
         """
-        errors = []
-        for error in exc.errors():  # Extract all validation errors
-            errors.append({
-                "field": ".".join(str(x) for x in error["loc"]),  # Field path (e.g., "body.email")
+        errors = [
+            {
+                "field": ".".join(map(str, error["loc"])),  # Field path (e.g., "body.email")
                 "message": error["msg"],  # Human-readable error message
-                "type": error["type"]  # Error type (e.g., "value_error.email")
-            })
+                "type": error["type"],  # Error type (e.g., "value_error.email")
+            }
+            for error in exc.errors()
+        ]
         
-        logger.warning(f"❌ Validation error on {request.url.path}: {errors}")
+        # Count only at WARNING - a flood of bad requests shouldn't pay to format every error list
+        logger.warning("❌ Validation error on %s (%d errors)", request.url.path, len(errors))
+        logger.debug("Validation errors on %s: %s", request.url.path, errors)
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={"error": "Validation Error", "detail": errors, "timestamp": time.time()}
@@ -125,7 +158,7 @@ def setup_exception_handlers(app: FastAPI) -> None:
         Security: Never expose database schema or internal errors to client.
         """
         logger.error(
-            f"❌ Database error on {request.method} {request.url.path}: {str(exc)}",
+            "❌ Database error on %s %s: %s", request.method, request.url.path, exc,
             exc_info=True  # Include full stack trace in logs
         )
         return JSONResponse(
@@ -144,7 +177,7 @@ def setup_exception_handlers(app: FastAPI) -> None:
         Prevents app crashes and logs full error details for debugging.
         """
         logger.error(
-            f"❌ Unhandled exception on {request.method} {request.url.path}: {str(exc)}",
+            "❌ Unhandled exception on %s %s: %s", request.method, request.url.path, exc,
             exc_info=True  # Full stack trace in logs
         )
         return JSONResponse(
@@ -170,45 +203,66 @@ def setup_event_handlers(app: FastAPI) -> None:
         try:
             validate_config()  # Validate environment variables and settings
         except Exception as e:
-            logger.error(f"❌ Configuration validation failed: {e}")
+            logger.error("❌ Configuration validation failed: %s", e)
             sys.exit(1)  # Exit immediately if config is invalid
         
-        if not check_db_connection():  # Verify database connectivity
+        if not await check_db_connection():  # Verify database connectivity
             logger.error("❌ Cannot connect to database. Exiting.")
             sys.exit(1)  # Exit if database unreachable
         
+        init_redis()  # Cache client - optional, requests fall back to DB if Redis is down
+        
         pool_stats = get_pool_stats()  # Log connection pool statistics
-        logger.info(f"📊 Database pool: {pool_stats}")
+        logger.info("📊 Database pool: %s", pool_stats)
         logger.info("✅ Application started successfully")
-        logger.info(f"🌍 Environment: {settings.ENVIRONMENT}")
-        logger.info(f"🔧 Debug mode: {settings.DEBUG}")
+        logger.info("🌍 Environment: %s", settings.ENVIRONMENT)
+        logger.info("🔧 Debug mode: %s", settings.DEBUG)
     
     @app.on_event("shutdown")
     async def shutdown_event():
         """Run on application shutdown - clean up resources gracefully"""
         logger.info("🛑 Shutting down Audit Trail System...")
-        close_db_connections()  # Close all database connections
+        await close_db_connections()  # Close all database connections
+        await close_redis()  # Close cache connections
         logger.info("✅ Shutdown complete")
 
 def setup_routers(app: FastAPI) -> None:
     """Mount API routers - will be implemented in next steps"""
     
+    # Last health result - load balancer probes within HEALTH_CACHE_TTL reuse it
+    # instead of each pinging the database
+    _health_cache = {"t": 0.0, "v": None}
+    _health_lock = asyncio.Lock()  # One probe recomputes, concurrent ones wait for its result
+    
     @app.get("/health", tags=["Health"])
     async def health_check():
         """
         Health check endpoint for monitoring and load balancers.
         Returns application status, database connectivity, and version info.
+        Result is cached for HEALTH_CACHE_TTL seconds.
         """
-        db_healthy = check_db_connection()  # Check if database is accessible
-        pool_stats = get_pool_stats()  # Get connection pool metrics
+        if time.monotonic() - _health_cache["t"] < settings.HEALTH_CACHE_TTL:
+            return Response(content=_health_cache["v"], media_type="application/json")
         
-        return {
-            "status": "healthy" if db_healthy else "unhealthy",
-            "database": "connected" if db_healthy else "disconnected",
-            "pool_stats": pool_stats,
-            "timestamp": time.time(),
-            "version": settings.APP_VERSION
-        }
+        async with _health_lock:
+            # Another probe may have refreshed it while we waited for the lock
+            if time.monotonic() - _health_cache["t"] < settings.HEALTH_CACHE_TTL:
+                return Response(content=_health_cache["v"], media_type="application/json")
+            
+            db_healthy = await check_db_connection()  # Check if database is accessible
+            pool_stats = get_pool_stats()  # Get connection pool metrics
+            
+            # Cache the encoded body, not the dict - cached probes skip
+            # jsonable_encoder + json.dumps entirely
+            _health_cache["v"] = JSONResponse({
+                "status": "healthy" if db_healthy else "unhealthy",
+                "database": "connected" if db_healthy else "disconnected",
+                "pool_stats": pool_stats,
+                "timestamp": time.time(),
+                "version": settings.APP_VERSION
+            }).body
+            _health_cache["t"] = time.monotonic()
+            return Response(content=_health_cache["v"], media_type="application/json")
     
     # Include API routers
     from app.api import auth, tasks, audit, users
@@ -2,11 +2,9 @@
 Audit Log Model - Immutable record of all user actions
 """
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID, INET
+from sqlalchemy import inspect, func, Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID, INET, JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 import enum
 
 from app.database import Base
@@ -35,26 +33,27 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     
     # When - timestamp with high precision
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Indexed for time-range queries
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Time-range queries use the indexes in __table_args__
     
     # Who - user identity
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)  # Which user performed action
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # Which user performed action (indexed via composite; NULL once user deleted)
     user_email = Column(String(255), nullable=False)  # Email snapshot (in case user deleted)
     user_ip = Column(INET, nullable=True)  # IP address for security tracking
     user_agent = Column(String(500), nullable=True)  # Browser/device info
     
     # What - action details
-    event_type = Column(SQLEnum(AuditEventType), nullable=False, index=True)  # Type of action performed
+    event_type = Column(SQLEnum(AuditEventType), nullable=False)  # Type of action performed (indexed via composite)
     resource_type = Column(String(50), nullable=True)  # What was affected (e.g., "task", "user")
     resource_id = Column(UUID(as_uuid=True), nullable=True, index=True)  # ID of affected resource
     
     # How - change details
     action = Column(String(100), nullable=False)  # Human-readable action description
-    changes = Column(JSON, nullable=True)  # Before/after data for updates: {"field": {"old": X, "new": Y}}
-    event_metadata = Column(JSON, nullable=True)  # Additional context (e.g., task title, error messages)
+    # JSONB: stored pre-parsed (no text re-parse on read) and indexable for containment/key queries
+    changes = Column(JSONB, nullable=True)  # Before/after data for updates: {"field": {"old": X, "new": Y}}
+    event_metadata = Column(JSONB, nullable=True)  # Additional context (e.g., task title, error messages)
     
     # Status
     status = Column(String(50), default="success", nullable=False)  # "success" or "failure"
@@ -63,12 +62,25 @@ class AuditLog(Base):
     user = relationship("User", back_populates="audit_logs")  # Link to user who performed action
     
     def __repr__(self):
-        """String representation for debugging"""
-        return f"<AuditLog {self.event_type} by {self.user_email} at {self.timestamp}>"
+        """String representation for debugging (primary key only - never triggers a load)"""
+        identity = inspect(self).identity  # From instance state, no attribute access
+        return f"<AuditLog {identity[0] if identity else 'pending'}>"
     
     # Index definitions for optimized queries
     __table_args__ = (
+        # Keyset pagination index: ORDER BY timestamp DESC, id DESC seeks straight to the cursor
+        Index("ix_audit_logs_timestamp_id", timestamp.desc(), id.desc()),
         # Composite index for common query pattern: "show me all actions by user X in date range Y"
         # Index order matters: most selective columns first
-        # This index speeds up: WHERE user_id = X AND timestamp BETWEEN Y AND Z
+        # This index speeds up: WHERE user_id = X AND timestamp BETWEEN Y AND Z (and per-user keyset pages)
+        Index("ix_audit_logs_user_timestamp_id", user_id, timestamp.desc(), id.desc()),
+        # Event type filter + newest-first ordering: WHERE event_type = X ORDER BY timestamp DESC
+        Index("ix_audit_logs_event_timestamp_id", event_type, timestamp.desc(), id.desc()),
+        # BRIN on timestamp: rows are appended in time order, so per-block min/max ranges
+        # let wide reporting scans (timestamp BETWEEN ...) skip most of the table.
+        # Tiny compared to a btree and nearly free to maintain on insert
+        Index("ix_audit_logs_timestamp_brin", timestamp, postgresql_using="brin"),
+        # GIN on changes: audit search like "which updates touched status" -
+        # WHERE changes ? 'status' or changes @> '{"status": {"new": "DONE"}}'
+        Index("ix_audit_logs_changes_gin", changes, postgresql_using="gin"),
     )
\ No newline at end of file
@@ -2,16 +2,19 @@
 Task Model - Represents work items in the system
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import inspect, func, Column, String, Text, DateTime, Index, Enum as SQLEnum, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 import enum
-import uuid
 
 
 from app.database import Base
 
+# Aware UTC "now" for updated_at on UPDATE (insert defaults are server-side)
+_utcnow = partial(datetime.now, timezone.utc)
+
 class TaskStatus(str, enum.Enum):
     """Task status enumeration - tracks task lifecycle"""
     TODO = "todo"  # Not started
@@ -33,7 +36,7 @@ class Task(Base):
     __tablename__ = "tasks"
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid(), index=True)
     
     # Task content
     title = Column(String(200), nullable=False)  # Short description (max 200 chars)
@@ -44,19 +47,33 @@ class Task(Base):
     priority = Column(SQLEnum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)  # Importance level
     
     # Ownership and assignment
-    created_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)  # User who created task
-    assigned_to_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)  # User responsible for task
+    created_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # User who created task (tasks go with their creator; indexed via composite)
+    assigned_to_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # User responsible for task (unassigned if user deleted; indexed via composite)
     
     # Timestamps - automatically managed
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # When task was created
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)  # Last modification time
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # When task was created (indexed via composites)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=_utcnow, nullable=False)  # Last modification time
     
     # Relationships - SQLAlchemy handles joins automatically
     creator = relationship("User", foreign_keys=[created_by_id], back_populates="tasks_created")  # Task creator
     assignee = relationship("User", foreign_keys=[assigned_to_id], back_populates="tasks_assigned")  # Task assignee
     
     def __repr__(self):
-        """String representation for debugging"""
-        return f"<Task {self.id}: {self.title} ({self.status})>"
-
-import uuid  # Import uuid at module level for default value
\ No newline at end of file
+        """String representation for debugging (primary key only - never triggers a load)"""
+        identity = inspect(self).identity  # From instance state, no attribute access
+        return f"<Task {identity[0] if identity else 'pending'}>"
+    
+    # Fetch server-generated id/created_at/updated_at with INSERT ... RETURNING during
+    # flush, so callers never need a refresh() round trip to read them
+    __mapper_args__ = {"eager_defaults": True}
+    
+    # Index definitions for optimized queries
+    __table_args__ = (
+        # "My tasks" lists: each branch of the created-by / assigned-to UNION ALL seeks its
+        # own index and reads rows already in newest-first order for ORDER BY ... LIMIT.
+        # Leading column also serves the FK lookups behind ON DELETE CASCADE / SET NULL
+        Index("ix_tasks_created_by_created_at_id", created_by_id, created_at.desc(), id.desc()),
+        Index("ix_tasks_assigned_to_created_at_id", assigned_to_id, created_at.desc(), id.desc()),
+        # Admin list: ORDER BY created_at DESC, id DESC and keyset seeks on (created_at, id)
+        Index("ix_tasks_created_at_id", created_at.desc(), id.desc()),
+    )
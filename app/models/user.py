@@ -2,11 +2,9 @@
 User Model - Represents authenticated users in the system
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import inspect, func, Column, String, Boolean, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 import enum
 
 from app.database import Base
@@ -24,7 +22,7 @@ class User(Base):
     __tablename__ = "users"
     
     # Primary key - UUID provides better security than auto-increment IDs
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid(), index=True)
     
     # Authentication fields
     email = Column(String(255), unique=True, nullable=False, index=True)  # Unique identifier for login
@@ -40,14 +38,29 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=False)  # Soft delete - deactivate instead of deleting
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Account creation time
-    last_login = Column(DateTime, nullable=True)  # Last successful login (updated on each login)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Account creation time
+    last_login = Column(DateTime(timezone=True), nullable=True)  # Last successful login (updated on each login)
     
     # Relationships - SQLAlchemy handles foreign key queries
-    tasks_created = relationship("Task", foreign_keys="Task.created_by_id", back_populates="creator")  # Tasks this user created
-    tasks_assigned = relationship("Task", foreign_keys="Task.assigned_to_id", back_populates="assignee")  # Tasks assigned to this user
-    audit_logs = relationship("AuditLog", back_populates="user")  # All audit logs for this user
+    # passive_deletes: deleting a user leaves child rows to the FK ON DELETE rules
+    # (one statement in Postgres) instead of SELECTing every child into memory first
+    tasks_created = relationship(
+        "Task", foreign_keys="Task.created_by_id", back_populates="creator",
+        passive_deletes=True  # ON DELETE CASCADE
+    )  # Tasks this user created
+    tasks_assigned = relationship(
+        "Task", foreign_keys="Task.assigned_to_id", back_populates="assignee",
+        passive_deletes=True  # ON DELETE SET NULL
+    )  # Tasks assigned to this user
+    audit_logs = relationship("AuditLog", back_populates="user", passive_deletes=True)  # All audit logs for this user (ON DELETE SET NULL)
     
     def __repr__(self):
-        """String representation for debugging"""
-        return f"<User {self.email} ({self.role})>"
\ No newline at end of file
+        """String representation for debugging (primary key only - never triggers a load)"""
+        identity = inspect(self).identity  # From instance state, no attribute access
+        return f"<User {identity[0] if identity else 'pending'}>"
+    
+    # Index definitions for optimized queries
+    __table_args__ = (
+        # Admin user list: WHERE is_active = X ORDER BY created_at DESC LIMIT n
+        Index("ix_users_active_created", is_active, created_at.desc()),
+    )
\ No newline at end of file
@@ -1,40 +1,43 @@
 """
 Schemas Package - Exports all Pydantic schemas
+
+Exports are resolved lazily (PEP 562): a submodule is imported, and its
+Pydantic models built, the first time one of its names is used.
 """
 
-from app.schemas.user import (
-    UserCreate,
-    UserLogin,
-    UserResponse,
-    UserUpdate,
-    TokenResponse,
-)
-from app.schemas.task import (
-    TaskCreate,
-    TaskUpdate,
-    TaskResponse,
-    TaskListResponse,
-)
-from app.schemas.audit import (
-    AuditLogResponse,
-    AuditLogListResponse,
-    AuditLogFilters,
-    AuditStatsResponse,
-)
+from importlib import import_module
+from typing import Any
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "MessageResponse": "app.schemas.common",
+    "UserCreate": "app.schemas.user",
+    "UserLogin": "app.schemas.user",
+    "UserResponse": "app.schemas.user",
+    "UserUpdate": "app.schemas.user",
+    "TokenResponse": "app.schemas.user",
+    "TaskCreate": "app.schemas.task",
+    "TaskUpdate": "app.schemas.task",
+    "TaskResponse": "app.schemas.task",
+    "TaskListItem": "app.schemas.task",
+    "TaskListResponse": "app.schemas.task",
+    "AuditLogResponse": "app.schemas.audit",
+    "AuditLogListResponse": "app.schemas.audit",
+    "AuditLogFilters": "app.schemas.audit",
+    "AuditStatsResponse": "app.schemas.audit",
+}
 
 # Export all schemas for convenient importing
-__all__ = [
-    "UserCreate",
-    "UserLogin",
-    "UserResponse",
-    "UserUpdate",
-    "TokenResponse",
-    "TaskCreate",
-    "TaskUpdate",
-    "TaskResponse",
-    "TaskListResponse",
-    "AuditLogResponse",
-    "AuditLogListResponse",
-    "AuditLogFilters",
-    "AuditStatsResponse",
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    """Import the defining submodule on first access (PEP 562)."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # Cache - later lookups skip __getattr__
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -2,7 +2,7 @@
 Audit Log Schemas - Pydantic models for audit log responses
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, IPvAnyAddress
 from typing import Optional, Any, List
 from datetime import datetime
 from uuid import UUID
@@ -13,26 +13,25 @@ class AuditLogResponse(BaseModel):
     """Schema for audit log entries in responses"""
     id: UUID  # Log entry unique identifier
     timestamp: datetime  # When action occurred
-    user_id: UUID  # User who performed action
+    user_id: Optional[UUID]  # User who performed action (None if the account was deleted - see user_email)
     user_email: str  # User email (snapshot)
-    user_ip: Optional[str]  # IP address of request
+    user_ip: Optional[IPvAnyAddress]  # IP address of request (INET column returns ipaddress objects)
     user_agent: Optional[str]  # Browser/device info
     event_type: AuditEventType  # Type of action
     resource_type: Optional[str]  # What was affected
     resource_id: Optional[UUID]  # ID of affected resource
     action: str  # Human-readable description
     changes: Optional[dict[str, Any]]  # Before/after data
-    metadata: Optional[dict[str, Any]]  # Additional context
+    metadata: Optional[dict[str, Any]] = Field(validation_alias="event_metadata")  # Additional context (ORM attribute is event_metadata)
     status: str  # "success" or "failure"
     
-    class Config:
-        from_attributes = True  # Pydantic V2 - replaces orm_mode
+    model_config = ConfigDict(from_attributes=True)  # Pydantic V2 - replaces orm_mode
 
 class AuditLogListResponse(BaseModel):
-    """Schema for paginated audit log list"""
+    """Schema for keyset-paginated audit log list"""
     logs: List[AuditLogResponse]  # List of audit logs (using List from typing)
-    total: int  # Total count
-    page: int  # Current page
+    total: Optional[int] = None  # Total count (only when include_total=true)
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get next page (None on last page)
     page_size: int  # Items per page
 
 class AuditLogFilters(BaseModel):
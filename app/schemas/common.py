@@ -0,0 +1,9 @@
+"""
+Common Schemas - Pydantic models shared across routers
+"""
+
+from pydantic import BaseModel
+
+class MessageResponse(BaseModel):
+    """Schema for simple confirmation responses (logout, delete, ...)"""
+    message: str  # Human-readable result
@@ -2,8 +2,8 @@
 Task Schemas - Pydantic models for task operations
 """
 
-from pydantic import BaseModel, validator
-from typing import Optional, List
+from pydantic import AfterValidator, BaseModel, ConfigDict, StringConstraints
+from typing import Annotated, Optional, List
 from datetime import datetime
 from uuid import UUID
 
@@ -11,6 +11,14 @@ from app.models.task import TaskStatus, TaskPriority
 
 # DO NOT import from app.schemas here - causes circular import
 
+# Input constraints - checked inside pydantic-core instead of Python validators
+TaskTitle = Annotated[str, StringConstraints(strip_whitespace=True, min_length=3, max_length=200)]  # max = database column size
+TaskDescription = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, max_length=5000),
+    AfterValidator(lambda v: v or None),  # Empty/blank description is stored as NULL
+]
+
 class TaskBase(BaseModel):
     """Base schema with common task fields"""
     title: str  # Task title/summary
@@ -20,52 +28,16 @@ class TaskBase(BaseModel):
 
 class TaskCreate(TaskBase):
     """Schema for creating new task"""
-    
-    @validator('title')
-    def validate_title(cls, v):
-        """Ensure title is not empty and within length limits"""
-        if not v or not v.strip():  # Empty title check
-            raise ValueError('Task title cannot be empty')
-        if len(v.strip()) < 3:  # Minimum length
-            raise ValueError('Task title must be at least 3 characters')
-        if len(v.strip()) > 200:  # Maximum length (database constraint)
-            raise ValueError('Task title cannot exceed 200 characters')
-        return v.strip()  # Return trimmed title
-    
-    @validator('description')
-    def validate_description(cls, v):
-        """Validate description length if provided"""
-        if v is not None and len(v) > 5000:  # Maximum length check
-            raise ValueError('Task description cannot exceed 5000 characters')
-        return v.strip() if v else None  # Trim whitespace
+    title: TaskTitle  # Trimmed, 3-200 chars
+    description: Optional[TaskDescription] = None  # Trimmed, max 5000 chars
 
 class TaskUpdate(BaseModel):
     """Schema for updating existing task - all fields optional"""
-    title: Optional[str] = None  # Update title if provided
-    description: Optional[str] = None  # Update description if provided
+    title: Optional[TaskTitle] = None  # Update title if provided (same rules as TaskCreate)
+    description: Optional[TaskDescription] = None  # Update description if provided
     status: Optional[TaskStatus] = None  # Update status if provided
     priority: Optional[TaskPriority] = None  # Update priority if provided
     assigned_to_id: Optional[UUID] = None  # Reassign task if provided
-    
-    @validator('title')
-    def validate_title(cls, v):
-        """Same validation as TaskCreate"""
-        if v is not None:  # Only validate if provided
-            if not v or not v.strip():
-                raise ValueError('Task title cannot be empty')
-            if len(v.strip()) < 3:
-                raise ValueError('Task title must be at least 3 characters')
-            if len(v.strip()) > 200:
-                raise ValueError('Task title cannot exceed 200 characters')
-            return v.strip()
-        return v
-    
-    @validator('description')
-    def validate_description(cls, v):
-        """Same validation as TaskCreate"""
-        if v is not None and len(v) > 5000:
-            raise ValueError('Task description cannot exceed 5000 characters')
-        return v.strip() if v else None
 
 class TaskResponse(TaskBase):
     """Schema for task data in responses"""
@@ -75,12 +47,25 @@ class TaskResponse(TaskBase):
     created_at: datetime  # Creation timestamp
     updated_at: datetime  # Last modification timestamp
     
-    class Config:
-        from_attributes = True  # Pydantic V2 - replaces orm_mode
+    model_config = ConfigDict(from_attributes=True)  # Pydantic V2 - replaces orm_mode
+
+class TaskListItem(BaseModel):
+    """Schema for tasks in list responses - no description (fetch the task for that)"""
+    id: UUID  # Task unique identifier
+    title: str  # Task title/summary
+    status: TaskStatus  # Current status
+    priority: TaskPriority  # Importance level
+    assigned_to_id: Optional[UUID] = None  # Assigned user (if any)
+    created_by_id: UUID  # User who created task
+    created_at: datetime  # Creation timestamp
+    updated_at: datetime  # Last modification timestamp
+    
+    model_config = ConfigDict(from_attributes=True)  # Pydantic V2 - replaces orm_mode
 
 class TaskListResponse(BaseModel):
     """Schema for paginated task list"""
-    tasks: List[TaskResponse]  # List of tasks (using List from typing)
-    total: int  # Total count (for pagination)
-    page: int  # Current page number
-    page_size: int  # Items per page
\ No newline at end of file
+    tasks: List[TaskListItem]  # List of tasks (using List from typing)
+    total: Optional[int] = None  # Total count (page-number requests only; None on cursor pages)
+    page: int  # Current page number (meaningless when the request used cursor - echoes the ignored ?page=)
+    page_size: int  # Items per page
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get next page (None on last page)
\ No newline at end of file
@@ -2,13 +2,20 @@
 User Schemas - Pydantic models for request/response validation
 """
 
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, StringConstraints, field_validator
+from typing import Annotated, Optional
 from datetime import datetime
 from uuid import UUID
+import re
 
 from app.models.user import UserRole
 
+# Display name - trimmed and length-checked inside pydantic-core
+FullName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=2)]
+
+# Password strength: a digit, an uppercase letter, 8+ characters (DOTALL - any character counts)
+_PASSWORD_RE = re.compile(r"(?=.*\d)(?=.*[A-Z]).{8,}", re.DOTALL)
+
 class UserBase(BaseModel):
     """Base schema with common user fields"""
     email: EmailStr  # Validates email format automatically
@@ -16,27 +23,19 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     """Schema for user registration - requires password"""
+    full_name: FullName  # Trimmed, at least 2 characters
     password: str  # Plaintext password (will be hashed before storage)
     
-    @validator('password')
-    def validate_password(cls, v):
-        """Enforce password strength requirements"""
-        if len(v) < 8:  # Minimum length check
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):  # Must contain number
-            raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):  # Must contain uppercase
-            raise ValueError('Password must contain at least one uppercase letter')
+    @field_validator('password')
+    @classmethod
+    def validate_password(cls, v: str) -> str:
+        """Enforce password strength requirements (one regex pass instead of three scans)"""
+        if not _PASSWORD_RE.fullmatch(v):
+            raise ValueError(
+                'Password must be at least 8 characters long and contain '
+                'at least one digit and one uppercase letter'
+            )
         return v  # Password valid
-    
-    @validator('full_name')
-    def validate_full_name(cls, v):
-        """Ensure name is not empty or just whitespace"""
-        if not v or not v.strip():  # Check for empty/whitespace
-            raise ValueError('Full name cannot be empty')
-        if len(v.strip()) < 2:  # Minimum 2 characters
-            raise ValueError('Full name must be at least 2 characters')
-        return v.strip()  # Return trimmed name
 
 class UserLogin(BaseModel):
     """Schema for login request"""
@@ -51,24 +50,12 @@ class UserResponse(UserBase):
     created_at: datetime  # Registration timestamp
     last_login: Optional[datetime]  # Last successful login (None if never logged in)
     
-    class Config:
-        from_attributes = True  # Pydantic V2 - replaces orm_mode
+    model_config = ConfigDict(from_attributes=True)  # Pydantic V2 - replaces orm_mode
 
 class UserUpdate(BaseModel):
     """Schema for updating user profile"""
-    full_name: Optional[str] = None  # Optional - only update if provided
+    full_name: Optional[FullName] = None  # Optional - only update if provided (same rules as UserCreate)
     email: Optional[EmailStr] = None  # Optional - only update if provided
-    
-    @validator('full_name')
-    def validate_full_name(cls, v):
-        """Same validation as UserCreate"""
-        if v is not None:  # Only validate if provided
-            if not v or not v.strip():
-                raise ValueError('Full name cannot be empty')
-            if len(v.strip()) < 2:
-                raise ValueError('Full name must be at least 2 characters')
-            return v.strip()
-        return v
 
 class TokenResponse(BaseModel):
     """Schema for authentication token response"""
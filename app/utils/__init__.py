@@ -3,25 +3,45 @@ Utilities Package - Helper functions and tools
 
 This package contains:
 - audit_logger.py: Automatic audit log creation helpers
+- pagination.py: Keyset pagination cursor helpers
+- http_cache.py: ETag / Cache-Control conditional responses
+
+Exports are resolved lazily (PEP 562): importing app.utils.pagination or
+app.utils.http_cache does not drag in audit_logger and, through it, the
+database engine and ORM models.
 """
 
-from app.utils.audit_logger import (
-    create_audit_log,
-    log_task_create,
-    log_task_update,
-    log_task_delete,
-    log_user_login,
-    log_user_logout,
-    log_user_register,
-)
+from importlib import import_module
+from typing import Any
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "AuditActor": "app.utils.audit_logger",
+    "create_audit_log": "app.utils.audit_logger",
+    "log_task_create": "app.utils.audit_logger",
+    "log_task_update": "app.utils.audit_logger",
+    "log_task_delete": "app.utils.audit_logger",
+    "log_user_login": "app.utils.audit_logger",
+    "log_user_logout": "app.utils.audit_logger",
+    "log_user_register": "app.utils.audit_logger",
+    "log_in_background": "app.utils.audit_logger",
+    "encode_cursor": "app.utils.pagination",
+    "decode_cursor": "app.utils.pagination",
+    "make_etag": "app.utils.http_cache",
+    "conditional_json_response": "app.utils.http_cache",
+}
 
 # Export audit logging functions
-__all__ = [
-    "create_audit_log",
-    "log_task_create",
-    "log_task_update",
-    "log_task_delete",
-    "log_user_login",
-    "log_user_logout",
-    "log_user_register",
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    """Import the defining submodule on first access (PEP 562)."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # Cache - later lookups skip __getattr__
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
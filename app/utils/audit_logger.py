@@ -2,18 +2,64 @@
 Audit Logger Utility - Automatically creates audit log entries
 """
 
-from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional, Dict, Any, Awaitable, Callable, NamedTuple, Tuple, Union
+from uuid import UUID
 from fastapi import Request
 import logging
 
+from app.database import SessionLocal
+from app.core.dependencies import invalidate_cached_user
 from app.models import AuditLog, User, AuditEventType
 
 logger = logging.getLogger(__name__)
 
-def create_audit_log(
-    db: Session,
-    user: User,
+# Fixed vocabularies for audit_logs.resource_type / status - single source of truth,
+# so every helper writes (and reports can filter on) exactly the same values
+RESOURCE_TASK = "task"
+RESOURCE_USER = "user"
+STATUS_SUCCESS = "success"
+STATUS_FAILURE = "failure"
+
+class AuditActor(NamedTuple):
+    """
+    Plain snapshot of who performed an action (all the audit helpers read).
+    
+    Background audit tasks run after the request's session is closed; passing
+    this instead of the ORM User means they never touch a detached instance.
+    """
+    id: UUID
+    email: str
+    
+    @classmethod
+    def of(cls, user: User) -> "AuditActor":
+        return cls(user.id, user.email)
+
+def _client_info(request: Request) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Client IP and User-Agent for a request, memoized on request.state.
+    
+    Parsed on first use rather than in a middleware, so requests that never
+    write an audit entry (most reads) don't pay for it.
+    
+    Returns:
+        (client_ip, user_agent) - either may be None
+    """
+    info = getattr(request.state, "client_info", None)
+    if info is None:
+        # Check X-Forwarded-For header first (for proxies/load balancers) - first IP is the client
+        user_ip = request.headers.get("X-Forwarded-For", "").split(",", 1)[0].strip()
+        if not user_ip and request.client:
+            user_ip = request.client.host  # Fallback to direct connection IP
+        info = (user_ip or None, request.headers.get("User-Agent"))
+        request.state.client_info = info
+    return info
+
+async def create_audit_log(
+    db: AsyncSession,
+    user: Union[User, AuditActor],
     event_type: AuditEventType,
     action: str,
     request: Optional[Request] = None,
@@ -21,14 +67,15 @@ def create_audit_log(
     resource_id: Optional[str] = None,
     changes: Optional[Dict[str, Any]] = None,
     metadata: Optional[Dict[str, Any]] = None,
-    status: str = "success"
-) -> AuditLog:
+    status: str = STATUS_SUCCESS,
+    commit: bool = True
+) -> None:
     """
     Create audit log entry for user action.
     
     Args:
         db: Database session
-        user: User who performed action
+        user: User who performed action (ORM User or AuditActor snapshot)
         event_type: Type of event (from AuditEventType enum)
         action: Human-readable description
         request: FastAPI request object (for IP and user agent)
@@ -37,40 +84,28 @@ def create_audit_log(
         changes: Before/after data for updates
         metadata: Additional context
         status: "success" or "failure"
-        
-    Returns:
-        Created AuditLog object
+        commit: Commit immediately; pass False to insert the entry in the caller's
+            transaction (caller commits/rolls back)
         
     Example:
-        create_audit_log(
+        await create_audit_log(
             db=db,
             user=current_user,
             event_type=AuditEventType.TASK_CREATE,
             action="Created task 'Fix homepage bug'",
             request=request,
-            resource_type="task",
+            resource_type=RESOURCE_TASK,
             resource_id=str(task.id),
             metadata={"task_title": task.title}
         )
     """
     
-    # Extract IP address from request
-    user_ip = None
-    if request:
-        # Check X-Forwarded-For header first (for proxies/load balancers)
-        user_ip = request.headers.get("X-Forwarded-For")
-        if user_ip:
-            user_ip = user_ip.split(",")[0].strip()  # Take first IP if multiple
-        else:
-            user_ip = request.client.host  # Fallback to direct connection IP
+    # Client IP / user agent (parsed once per request, shared by every log it writes)
+    user_ip, user_agent = _client_info(request) if request else (None, None)
     
-    # Extract user agent from request
-    user_agent = None
-    if request:
-        user_agent = request.headers.get("User-Agent")
-    
-    # Create audit log entry
-    audit_log = AuditLog(
+    # Core INSERT - audit rows are never read back, so skip the ORM unit of work
+    # (no identity map entry, no flush bookkeeping, no attribute instrumentation)
+    stmt = insert(AuditLog).values(
         user_id=user.id,  # Who performed action
         user_email=user.email,  # Email snapshot (in case user deleted)
         user_ip=user_ip,  # IP address
@@ -80,106 +115,146 @@ def create_audit_log(
         resource_id=resource_id,  # ID of affected resource
         action=action,  # Human-readable description
         changes=changes,  # Before/after data
-        metadata=metadata,  # Additional context
+        event_metadata=metadata,  # Additional context
         status=status,  # Success or failure
     )
     
+    # Part of a larger transaction - caller owns commit/rollback
+    if not commit:
+        await db.execute(stmt)
+        return
+    
     # Save to database
     try:
-        db.add(audit_log)  # Add to session
-        db.commit()  # Commit transaction
-        db.refresh(audit_log)  # Refresh to get generated ID and timestamp
-        logger.info(f"✅ Audit log created: {event_type.value} by {user.email}")
-        return audit_log
+        await db.execute(stmt)
+        await db.commit()  # Commit transaction
+        logger.info("✅ Audit log created: %s by %s", event_type.value, user.email)
     except Exception as e:
-        db.rollback()  # Rollback on error
-        logger.error(f"❌ Failed to create audit log: {str(e)}", exc_info=True)
+        await db.rollback()  # Rollback on error
+        logger.error("❌ Failed to create audit log: %s", e, exc_info=True)
         raise  # Re-raise to let caller handle error
 
-def log_task_create(db: Session, user: User, task: Any, request: Request) -> None:
-    """Helper function to log task creation"""
-    create_audit_log(
+async def log_task_create(db: AsyncSession, user: User, task: Any, request: Request) -> None:
+    """Helper function to log task creation (added to the caller's transaction - caller commits)"""
+    await create_audit_log(
         db=db,
         user=user,
         event_type=AuditEventType.TASK_CREATE,
         action=f"Created task '{task.title}'",
         request=request,
-        resource_type="task",
+        resource_type=RESOURCE_TASK,
         resource_id=str(task.id),
         metadata={
             "task_title": task.title,
             "task_status": task.status.value,
             "task_priority": task.priority.value,
-        }
+        },
+        commit=False  # Same transaction as the task write
     )
 
-def log_task_update(
-    db: Session,
+async def log_task_update(
+    db: AsyncSession,
     user: User,
     task: Any,
     old_data: Dict[str, Any],
     new_data: Dict[str, Any],
     request: Request
 ) -> None:
-    """Helper function to log task updates with before/after data"""
+    """Helper function to log task updates with before/after data (caller commits)"""
     
-    # Build changes dictionary
-    changes = {}
-    for field, new_value in new_data.items():
-        old_value = old_data.get(field)
-        if old_value != new_value:  # Only log actual changes
-            changes[field] = {"old": old_value, "new": new_value}
+    # Build changes dictionary - only fields whose value actually changed
+    changes = {
+        field: {"old": old_value, "new": new_data[field]}
+        for field, old_value in old_data.items()
+        if old_value != new_data[field]
+    }
     
     # Create readable action description
     changed_fields = ", ".join(changes.keys())
     action = f"Updated task '{task.title}' ({changed_fields})"
     
-    create_audit_log(
+    await create_audit_log(
         db=db,
         user=user,
         event_type=AuditEventType.TASK_UPDATE,
         action=action,
         request=request,
-        resource_type="task",
+        resource_type=RESOURCE_TASK,
         resource_id=str(task.id),
         changes=changes,
-        metadata={"task_title": task.title}
+        metadata={"task_title": task.title},
+        commit=False  # Same transaction as the task write
     )
 
-def log_task_delete(db: Session, user: User, task: Any, request: Request) -> None:
-    """Helper function to log task deletion"""
-    create_audit_log(
+async def log_task_delete(db: AsyncSession, user: User, task: Any, request: Request) -> None:
+    """Helper function to log task deletion (caller commits, together with the DELETE)"""
+    await create_audit_log(
         db=db,
         user=user,
         event_type=AuditEventType.TASK_DELETE,
         action=f"Deleted task '{task.title}'",
         request=request,
-        resource_type="task",
+        resource_type=RESOURCE_TASK,
         resource_id=str(task.id),
         metadata={
             "task_title": task.title,
             "task_status": task.status.value,
-        }
+        },
+        commit=False  # Same transaction as the task write
     )
 
-def log_user_login(db: Session, user: User, request: Request, success: bool = True) -> None:
-    """Helper function to log login attempts"""
+async def log_user_login(
+    db: AsyncSession,
+    user: Union[User, AuditActor],
+    request: Request,
+    success: bool = True,
+    last_login: Optional[datetime] = None
+) -> None:
+    """
+    Helper function to log login attempts.
+    
+    If last_login is given, users.last_login is updated in the same transaction
+    as the audit row - one commit per successful login.
+    The user's cached profile is dropped after that commit.
+    """
     event_type = AuditEventType.USER_LOGIN if success else AuditEventType.USER_LOGIN_FAILED
     action = "Successful login" if success else "Failed login attempt"
-    status = "success" if success else "failure"
+    status = STATUS_SUCCESS if success else STATUS_FAILURE
     
-    create_audit_log(
-        db=db,
-        user=user,
-        event_type=event_type,
-        action=action,
-        request=request,
-        status=status
-    )
+    if last_login is None:
+        await create_audit_log(
+            db=db,
+            user=user,
+            event_type=event_type,
+            action=action,
+            request=request,
+            status=status
+        )
+        return
+    
+    try:
+        await db.execute(update(User).where(User.id == user.id).values(last_login=last_login))
+        await create_audit_log(
+            db=db,
+            user=user,
+            event_type=event_type,
+            action=action,
+            request=request,
+            status=status,
+            commit=False  # Committed together with the last_login update below
+        )
+        await db.commit()
+        # Invalidate only now that the new last_login is committed - doing it earlier lets
+        # a /auth/me right after login reload the old value and cache it for USER_CACHE_TTL
+        invalidate_cached_user(user.id)
+        logger.info("✅ Audit log created: %s by %s", event_type.value, user.email)
+    except Exception:
+        await db.rollback()
+        raise
 
-def log_user_logout(db: Session, user: User, request: Request) -> None:
+async def log_user_logout(db: AsyncSession, user: Union[User, AuditActor], request: Request) -> None:
     """Helper function to log user logout"""
-    create_audit_log(
+    await create_audit_log(
         db=db,
         user=user,
         event_type=AuditEventType.USER_LOGOUT,
@@ -187,14 +262,36 @@ def log_user_logout(db: Session, user: User, request: Request) -> None:
         request=request
     )
 
-def log_user_register(db: Session, user: User, request: Request) -> None:
+async def log_user_register(db: AsyncSession, user: Union[User, AuditActor], request: Request) -> None:
     """Helper function to log user registration"""
-    create_audit_log(
+    await create_audit_log(
         db=db,
         user=user,
         event_type=AuditEventType.USER_REGISTER,
         action=f"New user registered: {user.email}",
         request=request,
-        resource_type="user",
+        resource_type=RESOURCE_USER,
         resource_id=str(user.id)
-    )
\ No newline at end of file
+    )
+
+async def log_in_background(log_func: Callable[..., Awaitable[None]], **kwargs: Any) -> None:
+    """
+    Run an audit helper in its own session - for use with BackgroundTasks.
+    
+    Background tasks run after the response is sent, when the request's session
+    has already been closed, so a fresh session is opened here. Failures are
+    logged and swallowed: there is no client left to report them to.
+    
+    Pass the user as an AuditActor snapshot taken while the request is live,
+    not the ORM object.
+    
+    Usage:
+        background.add_task(
+            log_in_background, log_user_logout, user=AuditActor.of(current_user), request=request
+        )
+    """
+    async with SessionLocal() as db:
+        try:
+            await log_func(db=db, **kwargs)
+        except Exception as e:
+            logger.error("❌ Background audit log failed (%s): %s", log_func.__name__, e)
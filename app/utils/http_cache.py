@@ -0,0 +1,60 @@
+"""
+HTTP Cache Utility - ETag / Cache-Control for idempotent JSON reads
+"""
+
+from typing import Union
+from fastapi import Request, Response
+import hashlib
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a weak ETag from a response body.
+
+    Weak because the hash covers the uncompressed JSON, while GZipMiddleware may
+    send the same representation gzip- or identity-coded; a strong validator
+    would have to differ per content-coding (RFC 9110 8.8.3). Weak comparison is
+    all If-None-Match needs.
+
+    blake2b with an 8-byte digest - fast, and collisions don't matter at this size
+    for cache validation.
+
+    Returns:
+        Weak ETag value, e.g. 'W/"9f86d081884c7d65"'
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def conditional_json_response(request: Request, body: Union[str, bytes], max_age: int) -> Response:
+    """
+    Return a pre-serialized JSON body with ETag + private Cache-Control headers.
+
+    If the client's If-None-Match matches the body's ETag, a bodiless
+    304 Not Modified is returned instead.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        body: JSON document, already serialized
+        max_age: Seconds the client may reuse the response without revalidating
+
+    Returns:
+        200 JSON response or 304 response
+    """
+    if isinstance(body, str):
+        body = body.encode()
+
+    etag = make_etag(body)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}",  # Per-user data - never in shared caches
+    }
+
+    # If-None-Match may hold several (possibly weak) tags: W/"a", "b" - weak
+    # comparison, so only the quoted opaque part is compared
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag.removeprefix("W/") in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,43 @@
+"""
+Pagination Utility - Opaque cursors for keyset (seek) pagination
+"""
+
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+import base64
+import binascii
+
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+
+    Args:
+        timestamp: Sort timestamp of the last returned row
+        row_id: Primary key of the last returned row (tie-breaker)
+
+    Returns:
+        URL-safe base64 string to pass back as ?cursor=...
+    """
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")  # Padding not needed in URLs
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Returns:
+        (timestamp, row_id) tuple to seek past
+
+    Raises:
+        ValueError: If the cursor is malformed or was tampered with
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)  # Restore stripped padding
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        timestamp, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e